@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
-from .backends import ReadOnlyError
+from .backends import Notification, ReadOnlyError, ResultTooLargeError
+from .codecs import Codecs
 from .database import Database, current_conn
+from .scheduler import PoolExhaustedError
 
-__all__ = "Database", "ReadOnlyError", "current_conn"
+__all__ = (
+    "Codecs",
+    "Database",
+    "Notification",
+    "PoolExhaustedError",
+    "ReadOnlyError",
+    "ResultTooLargeError",
+    "current_conn",
+)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from time import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .utils import percentile
+
+if TYPE_CHECKING:
+    from .backends import ABCDatabaseBackend
+
+
+class Decision(NamedTuple):
+    time: float
+    old: int
+    new: int
+    reason: str
+
+
+class Autoscaler:
+    """Adaptive sizing of a backend's pool (asyncio only).
+
+    The size is applied with `backend.resize` as the admission limit of the backend's scheduler,
+    idle connections above the size are closed by pools themselves (e.g. `pool_recycle`).
+
+    Every `interval` seconds the pool grows by `step` connections when there are waiters,
+    the p95 acquire wait exceeds `grow_wait` or the utilization exceeds `grow_utilization`.
+    It shrinks by one connection when the utilization stays below `shrink_utilization`
+    for `shrink_after` checks in a row. The size is always between `min_size` and `max_size`.
+
+    :param min_size: Minimum size (the initial size)
+    :param max_size: Maximum size (limited by `max_concurrency` and `connection_budget`)
+    :param interval: Seconds between checks
+    :param step: Number of connections to add at once
+    :param grow_wait: Grow when the p95 acquire wait is more than the given seconds
+    :param grow_utilization: Grow when the share of connections in use is more than the value
+    :param shrink_utilization: Shrink when the share of connections in use is less than the value
+    :param shrink_after: Number of checks in a row with a low utilization to shrink
+    :param history: Number of decisions to keep
+    """
+
+    __slots__ = (
+        "acquires",
+        "backend",
+        "decisions",
+        "grow_utilization",
+        "grow_wait",
+        "interval",
+        "low",
+        "max_size",
+        "min_size",
+        "shrink_after",
+        "shrink_utilization",
+        "size",
+        "step",
+        "task",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        backend: ABCDatabaseBackend,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        interval: float = 1.0,
+        step: int = 2,
+        grow_wait: float = 0.01,
+        grow_utilization: float = 0.8,
+        shrink_utilization: float = 0.3,
+        shrink_after: int = 10,
+        history: int = 100,
+    ):
+        if not 1 <= min_size <= max_size:
+            raise ValueError("min_size should be positive, and not more than max_size")
+
+        self.backend = backend
+        self.min_size = min_size
+        self.max_size = max_size
+        self.interval = interval
+        self.step = step
+        self.grow_wait = grow_wait
+        self.grow_utilization = grow_utilization
+        self.shrink_utilization = shrink_utilization
+        self.shrink_after = shrink_after
+        self.size = min_size
+        self.decisions: deque[Decision] = deque(maxlen=history)
+        self.task: asyncio.Task | None = None
+
+        # Checks in a row with a low utilization
+        self.low = 0
+
+        # Acquires at the last check
+        self.acquires = 0
+
+    def decide(self) -> tuple[int, str] | None:
+        """Get a new size and a reason or None to keep the current size."""
+        backend, size = self.backend, self.size
+
+        # Acquire waits since the last check
+        acquires = backend.metrics["acquires"]
+        samples = min(acquires - self.acquires, len(backend.acquire_waits))
+        self.acquires = acquires
+        waits = sorted(list(backend.acquire_waits)[-samples:]) if samples else []
+        wait = percentile(waits, 95)
+        utilization = backend.in_use / size
+
+        reason = None
+        if backend.waiting:
+            reason = f"{backend.waiting} waiting"
+        elif wait > self.grow_wait:
+            reason = f"p95 acquire wait {wait * 1000:.1f}ms"
+        elif utilization > self.grow_utilization:
+            reason = f"utilization {utilization:.0%}"
+
+        if reason:
+            self.low = 0
+            if size < self.max_size:
+                return min(self.max_size, size + self.step), reason
+            return None
+
+        if utilization >= self.shrink_utilization:
+            self.low = 0
+            return None
+
+        self.low += 1
+        if self.low < self.shrink_after or size <= self.min_size:
+            return None
+
+        self.low = 0
+        return size - 1, f"utilization {utilization:.0%} for {self.shrink_after} checks"
+
+    async def check(self) -> Decision | None:
+        """Resize the pool when it is required."""
+        decision = self.decide()
+        if decision is None:
+            return None
+
+        size, reason = decision
+        backend, old = self.backend, self.size
+        await backend.resize(size)
+        self.size = size
+
+        backend.metrics["pool_grows" if size > old else "pool_shrinks"] += 1
+        backend.logger.info("Pool resized %d -> %d (%s): %s", old, size, reason, backend)
+        result = Decision(time(), old, size, reason)
+        self.decisions.append(result)
+        return result
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                self.backend.logger.exception("Pool autoscaling failed: %s", self.backend)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        task, self.task = self.task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict[str, Any]:
+        """Get the current size and the last decisions."""
+        metrics = self.backend.metrics
+        return {
+            "size": self.size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "grows": metrics["pool_grows"],
+            "shrinks": metrics["pool_shrinks"],
+            "decisions": [decision._asdict() for decision in self.decisions],
+        }
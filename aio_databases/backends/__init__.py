@@ -2,22 +2,37 @@ from __future__ import annotations
 
 import abc
 import asyncio
-from contextlib import suppress
+from collections import Counter, deque
+from contextlib import AbstractContextManager, aclosing, nullcontext, suppress
+from inspect import isawaitable, signature
+from os import getenv, getpid
 from re import compile as re
-from typing import TYPE_CHECKING, Any, ClassVar, Generic
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, NamedTuple
 from urllib.parse import SplitResult, parse_qsl
+from warnings import warn
 
+from aio_databases.autoscale import Autoscaler
+from aio_databases.codecs import Codecs
+from aio_databases.export import Writer, open_target
 from aio_databases.log import logger as base_logger
+from aio_databases.record import row_size
+from aio_databases.scheduler import Scheduler
+from aio_databases.tracing import Tracer, normalize_sql
 from aio_databases.types import TVConnection
 from aio_databases.url import redact_url
+from aio_databases.utils import percentile
 
 if TYPE_CHECKING:
     import logging
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+    from os import PathLike
+    from typing import IO
 
     from typing_extensions import Self  # py310
 
-    from aio_databases.types import TInitConnection, TRecord
+    from aio_databases.export import TFormat
+    from aio_databases.types import TInitConnection, TRecord, TResult
 
 BACKENDS = []
 SHORTCUTS = {
@@ -26,21 +41,53 @@ SHORTCUTS = {
     "postgressql": "postgresql",
 }
 RE_PARAM = re(r"([^%])(%s)")
+ACQUIRE_SAMPLES = 1000
+MAX_STATEMENTS = 1000
 
 
 class ReadOnlyError(RuntimeError):
     """Raised when a write operation is attempted on a read-only connection."""
 
 
+class ResultTooLargeError(RuntimeError):
+    """Raised when a result exceeds the `max_rows` or `max_bytes` limits."""
+
+
+class ResultGuard:
+    """Count rows and approximate bytes of a result, raise when they exceed the limits."""
+
+    __slots__ = "bytes", "max_bytes", "max_rows", "rows"
+
+    def __init__(self, max_rows: int | None = None, max_bytes: int | None = None):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.rows = 0
+        self.bytes = 0
+
+    def check(self, rows: Sequence) -> None:
+        self.rows += len(rows)
+        if self.max_rows is not None and self.rows > self.max_rows:
+            raise ResultTooLargeError(f"The result has more than {self.max_rows} rows")
+
+        if self.max_bytes is not None:
+            self.bytes += sum(map(row_size, rows))
+            if self.bytes > self.max_bytes:
+                raise ResultTooLargeError(f"The result has more than {self.max_bytes} bytes")
+
+
 class ABCTransaction(abc.ABC, Generic[TVConnection]):
-    __slots__ = "connection", "silent"
+    __slots__ = "connection", "lazy", "silent"
 
-    def __init__(self, connection: ABCConnection[TVConnection], *, silent: bool = False):
+    def __init__(
+        self, connection: ABCConnection[TVConnection], *, silent: bool = False, lazy: bool = False
+    ):
         """Initialize the transaction.
         :param silent: Do not raise an error for commit/rollback
+        :param lazy: Defer BEGIN until the first query, skip empty transactions
         """
         self.connection = connection
         self.silent = silent
+        self.lazy = lazy
 
     @abc.abstractmethod
     async def _start(self) -> Self:
@@ -59,7 +106,8 @@ class ABCTransaction(abc.ABC, Generic[TVConnection]):
         return self
 
     async def __aexit__(self, exc_type, exc_value, exc_tb):
-        if self in self.connection.transactions:
+        connection = self.connection
+        if self in connection.transactions or self in connection.pending:
             if exc_type is not None:
                 await self.rollback()
             else:
@@ -70,7 +118,16 @@ class ABCTransaction(abc.ABC, Generic[TVConnection]):
         if not connection.is_ready:
             raise RuntimeError("There is no an acquired connection to start transactions")
 
-        await self._start()
+        if self.lazy:
+            connection.pending.append(self)
+            return
+
+        # Outer transactions have to be started first
+        if connection.pending:
+            await connection.begin()
+
+        with connection.span("transaction.start"):
+            await self._start()
         connection.transactions.add(self)
 
     async def commit(self, *, silent: bool | None = None):
@@ -78,9 +135,14 @@ class ABCTransaction(abc.ABC, Generic[TVConnection]):
         :param silent: Do not raise an error when the connection is closed
         """
         connection = self.connection
+        if self in connection.pending:
+            connection.pending.remove(self)
+            return None
+
         connection.transactions.discard(self)
         if connection.is_ready:
-            return await self._commit()
+            with connection.span("transaction.commit"):
+                return await self._commit()
 
         silent = self.silent if silent is None else silent
         if not silent:
@@ -92,9 +154,14 @@ class ABCTransaction(abc.ABC, Generic[TVConnection]):
         :param silent: Do not raise an error when the connection is closed
         """
         connection = self.connection
+        if self in connection.pending:
+            connection.pending.remove(self)
+            return None
+
         connection.transactions.discard(self)
         if connection.is_ready:
-            return await self._rollback()
+            with connection.span("transaction.rollback"):
+                return await self._rollback()
 
         silent = self.silent if silent is None else silent
         if not silent:
@@ -105,80 +172,277 @@ class ABCTransaction(abc.ABC, Generic[TVConnection]):
 class ABCConnection(abc.ABC, Generic[TVConnection]):
     transaction_cls: ClassVar[type[ABCTransaction]]
     lock_cls: type[asyncio.Lock] = asyncio.Lock
+    sleep: Callable[[float], Awaitable] = staticmethod(asyncio.sleep)
+
+    __slots__ = (
+        "_conn",
+        "_lock",
+        "backend",
+        "logger",
+        "pending",
+        "pid",
+        "priority",
+        "read_only",
+        "transactions",
+    )
 
-    __slots__ = "_conn", "_lock", "backend", "logger", "read_only", "transactions"
-
-    def __init__(self, backend: ABCDatabaseBackend, *, read_only: bool = False, **ignore):
+    def __init__(
+        self,
+        backend: ABCDatabaseBackend,
+        *,
+        read_only: bool = False,
+        priority: str | None = None,
+        **ignore,
+    ):
         self.backend = backend
         self.logger: logging.Logger = backend.logger
         self.transactions: set[ABCTransaction] = set()
+        self.pending: list[ABCTransaction] = []
         self._conn: TVConnection | None = None
         self._lock = self.lock_cls()
+        self.pid = 0
         self.read_only = read_only
+        self.priority = priority
 
     @property
     def is_ready(self) -> bool:
         return self._conn is not None
 
+    def span(self, name: str, sql: str | None = None) -> AbstractContextManager:
+        """Trace an operation (when a tracer is configured)."""
+        tracer = self.backend.tracer
+        if tracer is None:
+            return nullcontext()
+        return tracer.span(name, sql)
+
     async def acquire(self):
         if self._conn is None:
             async with self._lock:
-                self._conn = await self.backend.acquire()
+                self._conn = await self.backend.acquire(priority=self.priority)
+                self.pid = getpid()
 
     async def release(self, *_):
         if self._conn is not None:
             async with self._lock:
                 conn, self._conn = self._conn, None
-                await self.backend.release(conn)
+                # Connections of a parent process are abandoned (see `after_fork`)
+                if self.pid == getpid():
+                    await self.backend.release(conn, priority=self.priority)
 
     async def execute(self, query: Any, *params, **options) -> Any:
         if self.read_only:
             raise ReadOnlyError("Write operations are not allowed on read-only connections")
 
+        if self.pending:
+            await self.begin()
+
         sql = self.backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._execute(sql, *params, **options)
+        with self.span("execute", sql):
+            async with self._lock:
+                return await self._execute(sql, *params, **options)
 
-    async def executemany(self, query: Any, *params, **options) -> Any:
+    async def executemany(self, query: Any, *params, returning: bool = False, **options) -> Any:
+        """Execute the query for every params.
+
+        :param returning: Return rows of a RETURNING clause or generated keys (MySQL, SQLite)
+        """
         if self.read_only:
             raise ReadOnlyError("Write operations are not allowed on read-only connections")
 
-        sql = self.backend.__convert_sql__(query)
+        if self.pending:
+            await self.begin()
+
+        backend = self.backend
+        sql = backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._executemany(sql, *params, **options)
+        with self.span("executemany", sql):
+            async with self._lock:
+                if returning:
+                    return await self._executemany_returning(
+                        sql, *params, result=backend.result, **options
+                    )
+                return await self._executemany(sql, *params, **options)
 
-    async def fetchall(self, query: Any, *params, **options) -> list[TRecord]:
-        sql = self.backend.__convert_sql__(query)
+    async def fetchall(
+        self,
+        query: Any,
+        *params,
+        result: TResult | None = None,
+        as_: type | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        **options,
+    ) -> list[TRecord]:
+        """Fetch all rows.
+
+        :param max_rows: Raise `ResultTooLargeError` when the result has more rows
+        :param max_bytes: Raise `ResultTooLargeError` when the result is larger (approximately)
+        """
+        if self.pending:
+            await self.begin()
+
+        backend = self.backend
+        max_rows = backend.max_rows if max_rows is None else max_rows
+        max_bytes = backend.max_bytes if max_bytes is None else max_bytes
+        result = as_ or result or backend.result
+        sql = backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._fetchall(sql, *params, **options)
+        with self.span("fetchall", sql) as span:
+            async with self._lock:
+                if max_rows is None and max_bytes is None:
+                    rows = await self._fetchall(sql, *params, result=result, **options)
+                else:
+                    rows = await self._fetchall_limited(
+                        sql,
+                        *params,
+                        result=result,
+                        max_rows=max_rows,
+                        max_bytes=max_bytes,
+                        **options,
+                    )
+            if backend.track_results:
+                backend.track_result(sql, rows)
+            if span is not None:
+                span.set_attribute("db.response.returned_rows", len(rows))
+            return rows
+
+    async def fetchmany(
+        self,
+        size: int,
+        query: Any,
+        *params,
+        result: TResult | None = None,
+        as_: type | None = None,
+        **options,
+    ) -> list[TRecord]:
+        if self.pending:
+            await self.begin()
 
-    async def fetchmany(self, size: int, query: Any, *params, **options) -> list[TRecord]:
-        sql = self.backend.__convert_sql__(query)
+        backend = self.backend
+        sql = backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._fetchmany(size, sql, *params, **options)
+        with self.span("fetchmany", sql) as span:
+            async with self._lock:
+                rows = await self._fetchmany(
+                    size, sql, *params, result=as_ or result or backend.result, **options
+                )
+            if backend.track_results:
+                backend.track_result(sql, rows)
+            if span is not None:
+                span.set_attribute("db.response.returned_rows", len(rows))
+            return rows
+
+    async def fetchone(
+        self,
+        query: Any,
+        *params,
+        result: TResult | None = None,
+        as_: type | None = None,
+        **options,
+    ) -> TRecord | None:
+        if self.pending:
+            await self.begin()
 
-    async def fetchone(self, query: Any, *params, **options) -> TRecord | None:
-        sql = self.backend.__convert_sql__(query)
+        backend = self.backend
+        sql = backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._fetchone(sql, *params, **options)
+        with self.span("fetchone", sql):
+            async with self._lock:
+                return await self._fetchone(
+                    sql, *params, result=as_ or result or backend.result, **options
+                )
 
     async def fetchval(self, query: Any, *params, column: Any = 0, **options) -> Any:
+        if self.pending:
+            await self.begin()
+
         sql = self.backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            return await self._fetchval(sql, *params, column=column, **options)
+        with self.span("fetchval", sql):
+            async with self._lock:
+                return await self._fetchval(sql, *params, column=column, **options)
+
+    async def iterate(
+        self,
+        query: Any,
+        *params,
+        result: TResult | None = None,
+        as_: type | None = None,
+        **options,
+    ) -> AsyncIterator[TRecord]:
+        if self.pending:
+            await self.begin()
+
+        backend = self.backend
+        sql = backend.__convert_sql__(query)
+        self.logger.debug((sql, *params))
+        # Spans of generators are not attached to the context
+        tracer, count = backend.tracer, 0
+        span = tracer.start_span("iterate", sql) if tracer is not None else None
+        try:
+            async with self._lock:
+                async for res in self._iterate(
+                    sql, *params, result=as_ or result or backend.result, **options
+                ):
+                    count += 1
+                    yield res
+        finally:
+            if span is not None:
+                span.set_attribute("db.response.returned_rows", count)
+                span.end()
+
+    async def export(
+        self,
+        query: Any,
+        target: str | PathLike | IO[str],
+        *params,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+        **options,
+    ) -> int:
+        """Stream results into a CSV/JSON Lines file. Return the number of rows."""
+        if self.pending:
+            await self.begin()
 
-    async def iterate(self, query: Any, *params, **options) -> AsyncIterator[TRecord]:
         sql = self.backend.__convert_sql__(query)
         self.logger.debug((sql, *params))
-        async with self._lock:
-            async for res in self._iterate(sql, *params, **options):
-                yield res
+        with self.span("export", sql) as span, open_target(target) as fileobj:
+            async with self._lock:
+                count = await self._export(
+                    sql, fileobj, *params, format=format, header=header, **options
+                )
+            if span is not None:
+                span.set_attribute("db.response.returned_rows", count)
+            return count
+
+    async def _export(
+        self,
+        query: str,
+        fileobj: IO[str],
+        *params,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+        **options,
+    ) -> int:
+        writer, count = None, 0
+        async for rec in self._iterate(query, *params, result="record", **options):
+            if writer is None:
+                writer = Writer(fileobj, list(rec.keys()), format=format, header=header)
+            writer.write((tuple(rec.values()),))
+            count += 1
+
+        if writer is not None:
+            writer.flush()
+        return count
+
+    async def begin(self):
+        """Start deferred (lazy) transactions."""
+        pending, self.pending = self.pending, []
+        for trans in pending:
+            with self.span("transaction.start"):
+                await trans._start()
+            self.transactions.add(trans)
 
     @abc.abstractmethod
     async def _execute(self, query: str, *params, **options) -> Any:
@@ -188,10 +452,37 @@ class ABCConnection(abc.ABC, Generic[TVConnection]):
     async def _executemany(self, query: str, *params, **options) -> Any:
         raise NotImplementedError
 
+    async def _executemany_returning(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list:
+        """Execute the query for every params one by one and collect rows of RETURNING."""
+        rows = []
+        for args in params:
+            rows.extend(await self._fetchall(query, *args, result=result, **options))
+        return rows
+
     @abc.abstractmethod
     async def _fetchall(self, query: str, *params, **options) -> list:
         raise NotImplementedError
 
+    async def _fetchall_limited(
+        self,
+        query: str,
+        *params,
+        result: TResult | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        **options,
+    ) -> list:
+        """Fetch rows one by one and stop once the result exceeds the limits."""
+        guard, rows = ResultGuard(max_rows, max_bytes), []
+        records = self._iterate(query, *params, result=result, **options)
+        async with aclosing(records):  # type: ignore[bad-specialization]
+            async for rec in records:
+                guard.check((rec,))
+                rows.append(rec)
+        return rows
+
     @abc.abstractmethod
     async def _fetchmany(self, size: int, query: str, *params, **options) -> list:
         raise NotImplementedError
@@ -212,30 +503,259 @@ class ABCConnection(abc.ABC, Generic[TVConnection]):
         return self.transaction_cls(self, **params)
 
 
+class Notification(NamedTuple):
+    channel: str
+    payload: str
+    pid: int
+
+
+class ABCListener(abc.ABC, Generic[TVConnection]):
+    """Receive notifications (LISTEN/NOTIFY) with a dedicated connection outside of pools.
+
+    The connection is reopened and the channels are subscribed again after failures
+    (asyncio only).
+
+    :param reconnect_delay: A delay between attempts to reconnect
+    """
+
+    __slots__ = "_conn", "_lock", "_task", "backend", "callbacks", "reconnect_delay", "tasks"
+
+    def __init__(self, backend: ABCDatabaseBackend, *, reconnect_delay: float = 1.0):
+        self.backend = backend
+        self.reconnect_delay = reconnect_delay
+        self.callbacks: dict[str, list[Callable[[Notification], Any]]] = {}
+        self.tasks: set[asyncio.Future] = set()
+        self._conn: TVConnection | None = None
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @abc.abstractmethod
+    async def _connect(self) -> TVConnection:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _close(self, conn: TVConnection) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _listen(self, conn: TVConnection, channel: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _unlisten(self, conn: TVConnection, channel: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def _wait(self, conn: TVConnection) -> None:
+        """Wait (and dispatch notifications if required) until the connection is lost."""
+        raise NotImplementedError
+
+    async def listen(self, channel: str, callback: Callable[[Notification], Any]):
+        """Subscribe the callback (a function or a coroutine function) to the channel."""
+        # Concurrent subscribers share the connection opened by the first one
+        async with self._lock:
+            if self._task is None:
+                await self.connect()
+                self._task = asyncio.create_task(self.watch())
+
+        callbacks = self.callbacks.setdefault(channel, [])
+        callbacks.append(callback)
+        conn = self._conn
+        if conn is not None and len(callbacks) == 1:
+            await self._listen(conn, channel)
+
+    async def unlisten(self, channel: str, callback: Callable[[Notification], Any]):
+        callbacks = self.callbacks.get(channel)
+        if not callbacks or callback not in callbacks:
+            return
+
+        callbacks.remove(callback)
+        if not callbacks:
+            del self.callbacks[channel]
+            conn = self._conn
+            if conn is not None:
+                await self._unlisten(conn, channel)
+
+    async def connect(self):
+        """Open a connection and subscribe to the channels."""
+        conn = await self._connect()
+        subscribed: set[str] = set()
+        while pending := set(self.callbacks) - subscribed:
+            for channel in pending:
+                await self._listen(conn, channel)
+                subscribed.add(channel)
+        self._conn = conn
+
+    async def watch(self):
+        """Reconnect when the connection is lost."""
+        logger = self.backend.logger
+        while True:
+            conn = self._conn
+            if conn is not None:
+                with suppress(Exception):
+                    await self._wait(conn)
+
+                self._conn = None
+                with suppress(Exception):
+                    await self._close(conn)
+                logger.warning("Listener connection is lost, reconnecting")
+
+            try:
+                await self.connect()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Listener failed to reconnect: %s", exc)
+                await asyncio.sleep(self.reconnect_delay)
+
+    def dispatch(self, notification: Notification):
+        for callback in list(self.callbacks.get(notification.channel, ())):
+            res = callback(notification)
+            if isawaitable(res):
+                task = asyncio.ensure_future(res)
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def close(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await self._close(conn)
+
+        self.callbacks.clear()
+
+
 class ABCDatabaseBackend(abc.ABC, Generic[TVConnection]):
     name: ClassVar[str]
     db_type: str
     _pool: Any
 
+    # Pool backends do not open/close a connection per acquire/release
+    pooled: ClassVar[bool] = False
+
+    # Names of the pool's min/max size options (a connection budget is applied to them)
+    pool_size_options: ClassVar[tuple[str, str] | None] = None
+
+    # Backends which support LISTEN/NOTIFY
+    listener_cls: ClassVar[type[ABCListener] | None] = None
+
     connection_cls: ClassVar[type[ABCConnection]]
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         url: SplitResult,
         *,
         logger: logging.Logger = base_logger,
         convert_params: bool = False,
         init: TInitConnection | None = None,
+        max_concurrency: int | None = None,
+        max_waiting: int | None = None,
+        acquire_timeout: float | None = None,
+        priorities: tuple[str, ...] | None = None,
+        reserved: dict[str, int] | None = None,
+        default_priority: str | None = None,
+        result: TResult | None = None,
+        codecs: Codecs | None = None,
+        tracer: Any = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        track_results: bool = False,
+        autoscale: dict[str, Any] | None = None,
+        connection_budget: int | None = None,
+        workers: int | None = None,
         **options,
     ):
         self.url = url
         self.init = init
         self.logger = logger
         self.convert_params = convert_params
+        self.result = result
+        self.codecs = codecs or Codecs()
         self.options: dict[str, Any] = dict(parse_qsl(url.query), **options)
+        self.metrics: Counter[str] = Counter()
+        self.tracer = Tracer(tracer, self.db_type, url) if tracer is not None else None
+
+        # Result size limits and accounting (rows, bytes per normalized statement)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.track_results = track_results
+        self.statements: dict[str, Counter[str]] = {}
+
+        # Connections stats
+        self.in_use = 0
+        self.waiting = 0
+        self.acquire_waits: deque[float] = deque(maxlen=ACQUIRE_SAMPLES)
+
+        # The process which owns the connections and a lock to reopen them after a fork
+        self.pid = getpid()
+        self.fork_lock: tuple[int, Any] | None = None
+
+        # Admission control and autoscaling are built on asyncio
+        is_asyncio = issubclass(self.connection_cls.lock_cls, asyncio.Lock)
+
+        # Divide a host-level budget of connections across worker processes
+        self.max_connections: int | None = None
+        if connection_budget:
+            self.max_connections = max_connections = self.apply_budget(connection_budget, workers)
+            if autoscale is None and self.pool_size_options is None:
+                if is_asyncio:
+                    max_concurrency = min(max_concurrency or max_connections, max_connections)
+                else:
+                    self.logger.warning(
+                        "Connection budget is not enforced without a pool (asyncio only): %s",
+                        self,
+                    )
+
+        # Adaptive sizing starts from the minimum size
+        self.autoscaler: Autoscaler | None = None
+        if autoscale is not None:
+            # The maximum concurrency and the budget are upper bounds of the size
+            for limit in (max_concurrency, self.max_connections):
+                if limit:
+                    max_size = min(autoscale.get("max_size", limit), limit)
+                    min_size = min(autoscale.get("min_size", 1), max_size)
+                    autoscale = dict(autoscale, min_size=min_size, max_size=max_size)
+
+            self.autoscaler = Autoscaler(self, **autoscale)
+            max_concurrency = self.autoscaler.size
+
+        # Admission control
+        self.scheduler: Scheduler | None = None
+        if max_concurrency and not is_asyncio:
+            raise ValueError("Admission control (max_concurrency, autoscale) requires asyncio")
+
+        if max_concurrency:
+            self.scheduler = Scheduler(
+                max_concurrency,
+                max_waiting=max_waiting,
+                timeout=acquire_timeout,
+                priorities=priorities,
+                reserved=reserved,
+                default=default_priority,
+            )
 
     def __init_subclass__(cls, *args, **kwargs):
-        """Register a new backend class."""
+        """Register a new backend class.
+
+        Backends which implement `release(conn)` (older versions) get it as `_release`.
+        """
+        release = cls.__dict__.get("release")
+        if (
+            release is not None
+            and "_release" not in cls.__dict__
+            and "priority" not in signature(release).parameters
+        ):
+            warn(
+                f"{cls.__name__}.release(conn) is deprecated, implement _release(conn)",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            cls._release = release
+            cls.release = ABCDatabaseBackend.release
+
         BACKENDS.append(cls)
         return super().__init_subclass__(*args, **kwargs)
 
@@ -248,6 +768,14 @@ class ABCDatabaseBackend(abc.ABC, Generic[TVConnection]):
     def __convert_sql__(self, sql: Any) -> str:
         return str(sql)
 
+    def placeholder(self, num: int) -> str:
+        """Get a placeholder for the query param with the given number (from 1)."""
+        return "%s"
+
+    def is_transient(self, exc: BaseException) -> bool:
+        """Check the error is transient (serialization failure, deadlock) and can be retried."""
+        return False
+
     @property
     def pool(self) -> Any:
         _pool = self._pool
@@ -258,12 +786,160 @@ class ABCDatabaseBackend(abc.ABC, Generic[TVConnection]):
     def pool(self, value):
         self._pool = value
 
-    async def acquire(self) -> Any:
-        conn = await self._acquire()
-        init = self.init
-        if init is not None:
-            return await init(conn)
-        return conn
+    def apply_budget(self, budget: int, workers: int | None = None) -> int:
+        """Get a share of the connection budget per worker process and limit the pool with it.
+
+        The number of workers defaults to the `WEB_CONCURRENCY` environment variable.
+        """
+        workers = workers or int(getenv("WEB_CONCURRENCY", "1"))
+        if budget < workers:
+            self.logger.warning(
+                "Connection budget %d is less than %d workers: %s", budget, workers, self
+            )
+
+        max_connections = max(1, budget // workers)
+        size_options = self.pool_size_options
+        if size_options is not None:
+            min_name, max_name = size_options
+            options = self.options
+            max_size = min(int(options.get(max_name, max_connections)), max_connections)
+            options[max_name] = max_size
+            options[min_name] = min(int(options.get(min_name, 1)), max_size)
+
+        return max_connections
+
+    async def after_fork(self) -> None:
+        """Abandon connections inherited from a parent process and open new ones.
+
+        The inherited sockets are shared with the parent process, so they are not closed.
+        Concurrent acquirers wait until the connections are reopened.
+        """
+        pid = getpid()
+        if self.fork_lock is None or self.fork_lock[0] != pid:
+            self.fork_lock = (pid, self.connection_cls.lock_cls())
+
+        async with self.fork_lock[1]:
+            if self.pid == pid:
+                return
+
+            self.logger.warning("Process has been forked, reopening connections: %s", self)
+            self.in_use = self.waiting = 0
+            if self.scheduler is not None:
+                self.scheduler.reset()
+
+            if self.pooled and self._pool is not None:
+                self._pool = None
+                await self.connect()
+
+            self.pid = pid
+            self.metrics["forks"] += 1
+            autoscaler = self.autoscaler
+            if autoscaler is not None and autoscaler.task is not None:
+                autoscaler.task = None
+                autoscaler.start()
+
+    async def acquire(self, *, priority: str | None = None) -> Any:
+        if self.pid != getpid():
+            await self.after_fork()
+
+        tracer = self.tracer
+        with tracer.span("acquire") if tracer else nullcontext():
+            scheduler = self.scheduler
+            started = perf_counter()
+            self.waiting += 1
+            try:
+                if scheduler is not None:
+                    await scheduler.acquire(priority)
+
+                try:
+                    conn = await self._acquire()
+                    init = self.init
+                    if init is not None:
+                        conn = await init(conn)
+
+                except BaseException:
+                    if scheduler is not None:
+                        scheduler.release(priority)
+                    raise
+
+            finally:
+                self.waiting -= 1
+
+            metrics = self.metrics
+            metrics["acquires"] += 1
+            if not self.pooled:
+                metrics["connections_created"] += 1
+            self.in_use += 1
+            self.acquire_waits.append(perf_counter() - started)
+            return conn
+
+    async def release(self, conn: TVConnection, *, priority: str | None = None) -> None:
+        self.in_use -= 1
+        try:
+            await self._release(conn)
+        finally:
+            if not self.pooled:
+                self.metrics["connections_closed"] += 1
+            if self.scheduler is not None:
+                self.scheduler.release(priority)
+
+    def track_result(self, sql: str, rows: list) -> None:
+        """Count rows and approximate bytes returned by the statement."""
+        statements = self.statements
+        key = normalize_sql(sql)
+        if key not in statements and len(statements) >= MAX_STATEMENTS:
+            key = "<other>"
+
+        counter = statements.setdefault(key, Counter())
+        counter["calls"] += 1
+        counter["rows"] += len(rows)
+        counter["bytes"] += sum(map(row_size, rows))
+
+    def stats(self) -> dict[str, Any]:
+        """Get a snapshot of the backend's connections.
+
+        Pool backends update the snapshot with `pool_stats`, unknown values are None.
+        """
+        waits = sorted(self.acquire_waits)
+        metrics = self.metrics
+        stats: dict[str, Any] = {
+            "backend": self.name,
+            "url": redact_url(self.url).geturl(),
+            "open": self.in_use,
+            "idle": 0,
+            "in_use": self.in_use,
+            "waiters": self.waiting,
+            "max_size": None,
+            "acquires": metrics["acquires"],
+            "created": metrics["connections_created"],
+            "closed": metrics["connections_closed"],
+            "acquire_wait": {
+                "mean": sum(waits) / len(waits) if waits else 0.0,
+                "p50": percentile(waits, 50),
+                "p95": percentile(waits, 95),
+                "p99": percentile(waits, 99),
+                "max": waits[-1] if waits else 0.0,
+            },
+        }
+        if self.pooled and self._pool is not None:
+            stats.update(self.pool_stats())
+        if self.autoscaler is not None:
+            stats["autoscale"] = self.autoscaler.stats()
+        return stats
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Get sizes of the pool (open, idle, max_size, created, closed)."""
+        return {"created": None, "closed": None}
+
+    async def resize(self, size: int) -> None:
+        """Set the number of connections in use (the admission limit).
+
+        Idle connections above the size are closed by pools themselves (e.g. `pool_recycle`).
+        """
+        scheduler = self.scheduler
+        assert scheduler is not None, "Admission control is not configured"
+        scheduler.limit = size
+        scheduler.wakeup()
 
     async def connect(self) -> None:
         self.logger.info("Connecting to %s", redact_url(self.url).geturl())
@@ -276,7 +952,7 @@ class ABCDatabaseBackend(abc.ABC, Generic[TVConnection]):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def release(self, conn: TVConnection) -> None:
+    async def _release(self, conn: TVConnection) -> None:
         raise NotImplementedError
 
     def connection(self, **params) -> ABCConnection[TVConnection]:
@@ -287,8 +963,10 @@ class ABCDatabaseBackend(abc.ABC, Generic[TVConnection]):
 #  -------------------------
 
 from ._dummy import Backend as DummyBackend  # A dummy backend for testing
+from ._simulated import Backend as SimulatedBackend  # A backend to model latency
 
 assert issubclass(DummyBackend, ABCDatabaseBackend)
+assert issubclass(SimulatedBackend, ABCDatabaseBackend)
 
 with suppress(ImportError):
     from ._aiosqlite import Backend as AIOSQLiteBackend
@@ -323,7 +1001,9 @@ with suppress(ImportError):
 
 with suppress(ImportError):
     from ._trio_mysql import Backend as TrioMySQLBackend
+    from ._trio_mysql import PoolBackend as TrioMySQLPoolBackend
 
     assert issubclass(TrioMySQLBackend, ABCDatabaseBackend)
+    assert issubclass(TrioMySQLPoolBackend, ABCDatabaseBackend)
 
 # ruff: noqa: E402
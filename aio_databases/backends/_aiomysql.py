@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from aiomysql import Connection, Pool, connect, create_pool
+from typing import Any
+
+from aiomysql import Connection, Pool, SSCursor, connect, create_pool
+from pymysql import converters
+from pymysql.constants import FIELD_TYPE
+from pymysql.err import MySQLError
 
 from . import ABCDatabaseBackend
-from .common import Connection as Session
+from .common import MYSQL_TRANSIENT_ERRORS, mysql_conv
+from .common import Connection as Connection_
+
+
+class Session(Connection_[Connection]):
+    stream_cursor_cls = SSCursor
 
 
 class Backend(ABCDatabaseBackend[Connection]):
@@ -19,16 +29,25 @@ class Backend(ABCDatabaseBackend[Connection]):
         self.options["user"] = url.username
         self.options["password"] = url.password
         self.options["db"] = url.path.strip("/")
+        if self.codecs:
+            self.options["conv"] = mysql_conv(self.codecs, converters, FIELD_TYPE)
+
+    def is_transient(self, exc: BaseException) -> bool:
+        if isinstance(exc, MySQLError) and exc.args:
+            return exc.args[0] in MYSQL_TRANSIENT_ERRORS
+        return False
 
     async def _acquire(self) -> Connection:
         return await connect(**self.options)
 
-    async def release(self, conn: Connection):
+    async def _release(self, conn: Connection):
         conn.close()
 
 
 class PoolBackend(Backend):
     name = "aiomysql+pool"
+    pooled = True
+    pool_size_options = ("minsize", "maxsize")
 
     _pool: Pool | None = None
 
@@ -51,5 +70,15 @@ class PoolBackend(Backend):
     async def _acquire(self) -> Connection:
         return await self.pool.acquire()
 
-    async def release(self, conn: Connection):
+    async def _release(self, conn: Connection):
         await self.pool.release(conn)
+
+    def pool_stats(self) -> dict[str, Any]:
+        pool = self.pool
+        return {
+            "open": pool.size,
+            "idle": pool.freesize,
+            "max_size": pool.maxsize,
+            "created": None,
+            "closed": None,
+        }
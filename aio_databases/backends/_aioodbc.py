@@ -1,11 +1,18 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, cast
 
 import aioodbc
 
+from aio_databases.record import row_factory
+
 from . import RE_PARAM, ABCDatabaseBackend
-from .common import Connection
+from .common import Connection as BaseConnection
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from aio_databases.types import TRecord, TResult
 
 
 class DBType:
@@ -16,13 +23,65 @@ class DBType:
         return obj.options["dsn"]
 
 
+class Connection(BaseConnection):
+    async def _executemany(self, query: str, *params, **options) -> Any:
+        conn = self._conn
+        assert conn is not None
+        async with conn.cursor() as cursor:
+            # Bind params as arrays and send them at once, aioodbc has no public access to
+            # the pyodbc cursor
+            if cast("Backend", self.backend).fast_executemany:
+                cursor._impl.fast_executemany = True
+            await cursor.executemany(query, params, **options)
+
+    async def _fetchall_limited(
+        self, query: str, *params, chunk_size: int | None = None, **options
+    ):
+        arraysize = cast("Backend", self.backend).arraysize
+        return await super(Connection, self)._fetchall_limited(
+            query, *params, chunk_size=chunk_size or arraysize, **options
+        )
+
+    async def _iterate(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> AsyncIterator[TRecord]:
+        conn = self._conn
+        assert conn is not None
+        async with conn.cursor() as cursor:
+            # Fetch rows by arrays, not one by one
+            cursor.arraysize = arraysize = cast("Backend", self.backend).arraysize
+            await cursor.execute(query, params, **options)
+            factory = row_factory(result, cursor.description)
+            while rows := await cursor.fetchmany(arraysize):
+                for row in rows:
+                    yield row if factory is None else factory(row)
+
+
 class Backend(ABCDatabaseBackend[aioodbc.Connection]):
     name = "aioodbc"
     db_type = "odbc"
     connection_cls = Connection
 
-    def __init__(self, *args, db_type: str | None = None, **kwargs):
+    # Parameter arrays of executemany and a number of rows fetched at once (see `__init__`)
+    fast_executemany: bool
+    arraysize: int
+
+    def __init__(
+        self,
+        *args,
+        db_type: str | None = None,
+        fast_executemany: bool = False,
+        arraysize: int = 1000,
+        **kwargs,
+    ):
+        """
+        :param fast_executemany: Send params of executemany as arrays (pyodbc), enable it
+            for drivers which support parameter arrays
+        :param arraysize: Number of rows fetched at once by iterate
+        """
         self.db_type = db_type or self.db_type
+        self.fast_executemany = fast_executemany
+        self.arraysize = arraysize
         super(Backend, self).__init__(*args, **kwargs)
 
     def __convert_sql__(self, sql: Any) -> str:
@@ -31,15 +90,20 @@ class Backend(ABCDatabaseBackend[aioodbc.Connection]):
             sql = RE_PARAM.sub(r"\1?", sql)
         return sql
 
-    async def _acquire(self):  # type: ignore[]
-        return aioodbc.connect(**self.options)
+    def placeholder(self, num: int) -> str:
+        return "?"
+
+    async def _acquire(self) -> aioodbc.Connection:
+        return await aioodbc.connect(**self.options)
 
-    async def release(self, conn: aioodbc.Connection):
+    async def _release(self, conn: aioodbc.Connection):
         await conn.close()
 
 
 class PoolBackend(Backend):
     name = "aioodbc+pool"
+    pooled = True
+    pool_size_options = ("minsize", "maxsize")
 
     _pool: aioodbc.Pool | None = None
 
@@ -62,5 +126,15 @@ class PoolBackend(Backend):
     async def _acquire(self):
         return await self.pool.acquire()
 
-    async def release(self, conn: aioodbc.Connection):
+    async def _release(self, conn: aioodbc.Connection):
         await self.pool.release(conn)
+
+    def pool_stats(self) -> dict[str, Any]:
+        pool = self.pool
+        return {
+            "open": pool.size,
+            "idle": pool.freesize,
+            "max_size": pool.maxsize,
+            "created": None,
+            "closed": None,
+        }
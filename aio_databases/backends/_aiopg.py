@@ -1,14 +1,100 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, cast
+from uuid import uuid4
 
 from aiopg import Connection, Pool, connect, create_pool
+from psycopg2.extensions import cursor as BaseCursor  # noqa: N812
+from psycopg2.extensions import new_type, register_type
 
-from . import ABCDatabaseBackend
+from . import ABCDatabaseBackend, ABCListener, Notification
+from .common import PG_TRANSIENT_ERRORS, is_cursor_query
 from .common import Connection as Ses
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from aiopg import Cursor
+
+
+def encoding_cursor(encoders: dict[type, Callable], base: type = BaseCursor) -> type:
+    """Get a psycopg2 cursor class which encodes params by their types.
+
+    psycopg2 adapters are global, the cursor keeps encoders per a connection.
+    """
+
+    def encode(value: Any) -> Any:
+        encoder = encoders.get(type(value))
+        return value if encoder is None else encoder(value)
+
+    class EncodingCursor(base):
+        def execute(self, query, params=None):
+            if isinstance(params, dict):
+                params = {name: encode(value) for name, value in params.items()}
+            elif params is not None:
+                params = tuple(map(encode, params))
+            return super(EncodingCursor, self).execute(query, params)
+
+    return EncodingCursor
+
+
+class ServerCursor:
+    """Read a result of a declared cursor (psycopg2 async connections have no named cursors)."""
+
+    __slots__ = "cursor", "name"
+
+    def __init__(self, cursor: Cursor, name: str):
+        self.cursor = cursor
+        self.name = name
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+    async def fetchmany(self, size: int) -> list:
+        await self.cursor.execute(f"FETCH FORWARD {int(size)} FROM {self.name}")
+        return await self.cursor.fetchall()
+
 
 class Session(Ses[Connection]):
+    @asynccontextmanager
+    async def _stream(self, query: str, params: tuple, **options) -> AsyncIterator[Any]:
+        """Declare a server-side cursor (in a transaction) to read the result by chunks.
+
+        Other queries (e.g. INSERT ... RETURNING) are read with a client-side cursor.
+        """
+        if not is_cursor_query(query):
+            async with super(Session, self)._stream(query, params, **options) as cursor:
+                yield cursor
+            return
+
+        conn = self._conn
+        assert conn is not None, "Database is not connected"
+        name = f"aiodb_{uuid4().hex}"
+        async with conn.cursor() as cursor:
+            # Cursors live inside a transaction
+            standalone = not self.transactions
+            if standalone:
+                await cursor.execute("BEGIN")
+            try:
+                await cursor.execute(
+                    f"DECLARE {name} NO SCROLL CURSOR FOR {query}", params, **options
+                )
+                # Get a description of the result
+                await cursor.execute(f"FETCH FORWARD 0 FROM {name}")
+                yield ServerCursor(cursor, name)
+                await cursor.execute(f"CLOSE {name}")
+
+            except BaseException:
+                if standalone:
+                    await cursor.execute("ROLLBACK")
+                raise
+
+            if standalone:
+                await cursor.execute("COMMIT")
+
     async def _executemany(self, query: str, *params, **options) -> Any:
         conn = self._conn
         assert conn is not None, "Database is not connected"
@@ -17,24 +103,111 @@ class Session(Ses[Connection]):
                 await cursor.execute(query, args_, **options)
 
 
+class Listener(ABCListener[Connection]):
+    # Check the connection when there are no notifications for the given time
+    ping_interval = 10.0
+
+    async def _connect(self) -> Connection:
+        if cast("Backend", self.backend).pooler_mode:
+            raise RuntimeError("LISTEN requires a session, it is not supported in pooler mode")
+
+        # A dedicated connection, outside of a pool
+        return await Backend._acquire(self.backend)  # type: ignore[bad-argument-type]
+
+    async def _close(self, conn: Connection):
+        await conn.close()
+
+    async def _listen(self, conn: Connection, channel: str):
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"LISTEN {quote_ident(channel)}")
+
+    async def _unlisten(self, conn: Connection, channel: str):
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"UNLISTEN {quote_ident(channel)}")
+
+    async def _wait(self, conn: Connection):
+        notifies = conn.notifies
+        while not conn.closed:
+            try:
+                msg = await asyncio.wait_for(notifies.get(), self.ping_interval)
+            except asyncio.TimeoutError:  # noqa: PERF203
+                async with conn.cursor() as cursor:
+                    await cursor.execute("SELECT 1")
+            else:
+                self.dispatch(Notification(msg.channel, msg.payload, msg.pid))
+
+
+def quote_ident(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
 class Backend(ABCDatabaseBackend[Connection]):
     name = "aiopg"
     db_type = "postgresql"
     connection_cls = Session
+    listener_cls = Listener
+
+    # Work behind a transaction-mode pooler (see `__init__`)
+    pooler_mode: bool
 
-    def __init__(self, url, **kwargs):
+    def __init__(self, url, *, pooler_mode: bool = False, **kwargs):
+        """
+        :param pooler_mode: Work behind a transaction-mode pooler (PgBouncer). psycopg2 does
+            not use named prepared statements, only LISTEN is disabled
+        """
         super(Backend, self).__init__(url, **kwargs)
+        self.pooler_mode = pooler_mode
         self.dsn = self.url._replace(scheme="postgresql").geturl()
 
+        encoders = {
+            codec.python_type: codec.encoder
+            for codec in self.codecs
+            if codec.encoder and codec.python_type
+        }
+        if encoders:
+            self.options["cursor_factory"] = encoding_cursor(
+                encoders, self.options.get("cursor_factory") or BaseCursor
+            )
+
+    def is_transient(self, exc: BaseException) -> bool:
+        return getattr(exc, "pgcode", None) in PG_TRANSIENT_ERRORS
+
+    async def setup_codecs(self, conn: Connection):
+        """Install the decoders into a new connection."""
+        codecs = self.codecs.codecs
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                "SELECT t.oid, t.typname, n.nspname FROM pg_type t "
+                "JOIN pg_namespace n ON n.oid = t.typnamespace WHERE t.typname = ANY(%s)",
+                (list(codecs),),
+            )
+            types = await cursor.fetchall()
+
+        for oid, typename, schema in types:
+            codec = codecs[typename]
+            decoder = codec.decoder
+            if decoder and codec.schema == schema:
+                caster = new_type(
+                    (oid,),
+                    typename.upper(),
+                    lambda value, _, dec=decoder: None if value is None else dec(value),
+                )
+                register_type(caster, conn.raw)
+
     async def _acquire(self) -> Connection:
-        return await connect(self.dsn, **self.options)
+        conn = await connect(self.dsn, **self.options)
+        if self.codecs:
+            await self.setup_codecs(conn)
+        return conn
 
-    async def release(self, conn: Connection):
+    async def _release(self, conn: Connection):
         conn.close()
 
 
 class PoolBackend(Backend):
     name = "aiopg+pool"
+    pooled = True
+    pool_size_options = ("minsize", "maxsize")
 
     _pool: Pool | None = None
 
@@ -47,7 +220,20 @@ class PoolBackend(Backend):
         }
 
     async def connect(self) -> None:
-        self.pool = await create_pool(self.dsn, **self.options, **self.pool_options)
+        pool_options: dict[str, Any] = dict(self.pool_options)
+        on_connect = pool_options.get("on_connect")
+
+        # Codecs are installed once per a new connection
+        async def setup(conn: Connection):
+            self.metrics["connections_created"] += 1
+            if self.codecs:
+                await self.setup_codecs(conn)
+            if on_connect is not None:
+                await on_connect(conn)
+
+        pool_options["on_connect"] = setup
+
+        self.pool = await create_pool(self.dsn, **self.options, **pool_options)
 
     async def disconnect(self) -> None:
         pool = self.pool
@@ -57,5 +243,16 @@ class PoolBackend(Backend):
     async def _acquire(self) -> Connection:
         return await self.pool.acquire()
 
-    async def release(self, conn: Connection):
+    async def _release(self, conn: Connection):
         await self.pool.release(conn)
+
+    def pool_stats(self) -> dict[str, Any]:
+        pool = self.pool
+        created = self.metrics["connections_created"]
+        return {
+            "open": pool.size,
+            "idle": pool.freesize,
+            "max_size": pool.maxsize,
+            "created": created,
+            "closed": created - pool.size,
+        }
@@ -1,14 +1,264 @@
 from __future__ import annotations
 
+import sqlite3
+import threading
 from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl
 
 import aiosqlite
 
-from . import RE_PARAM, ABCDatabaseBackend
-from .common import Connection
+from aio_databases.export import Writer
+from aio_databases.record import row_factory
+
+from . import RE_PARAM, ABCDatabaseBackend, ReadOnlyError, ResultGuard
+from .common import RE_RETURNING
+from .common import Connection as BaseConnection
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable, Iterable
+    from typing import IO
+
+    from aio_databases.export import TFormat
+    from aio_databases.types import TRecord, TResult
+
+
+# Codecs of connections by their worker threads (sqlite3 adapters and converters are global)
+thread_codecs = threading.local()
+
+# Registered adapters and converters which dispatch values to the thread codecs
+ADAPTERS: dict[type, Callable] = {}
+CONVERTERS: dict[str, Callable] = {}
+
+
+def sqlite_set_codecs(encoders: dict[type, Callable], decoders: dict[str, Callable]):
+    thread_codecs.encoders = encoders
+    thread_codecs.decoders = decoders
+
+
+def sqlite_register_codecs(encoders: dict[type, Callable], decoders: dict[str, Callable]):
+    """Register global adapters and converters, they fall back to previously registered ones.
+
+    Connections without a codec for a declared type get raw bytes from sqlite3 converters.
+    """
+    for python_type in encoders:
+        key = (python_type, sqlite3.PrepareProtocol)
+        fallback = sqlite3.adapters.get(key)
+        if fallback is None or fallback is not ADAPTERS.get(python_type):
+
+            def adapt(value, python_type=python_type, fallback=fallback):
+                encoder = getattr(thread_codecs, "encoders", {}).get(python_type, fallback)
+                return value if encoder is None else encoder(value)
+
+            ADAPTERS[python_type] = adapt
+            sqlite3.register_adapter(python_type, adapt)
+
+    for typename in decoders:
+        fallback = sqlite3.converters.get(typename)
+        if fallback is None or fallback is not CONVERTERS.get(typename):
+
+            def convert(value, typename=typename, fallback=fallback):
+                decoder = getattr(thread_codecs, "decoders", {}).get(typename, fallback)
+                return value if decoder is None else decoder(value)
+
+            CONVERTERS[typename] = convert
+            sqlite3.register_converter(typename, convert)
+
+
+def sqlite_execute(conn: sqlite3.Connection, query: str, params: tuple) -> tuple[int, Any]:
+    cursor = conn.execute(query, params)
+    try:
+        return cursor.rowcount, cursor.lastrowid
+    finally:
+        cursor.close()
+
+
+def sqlite_executemany(conn: sqlite3.Connection, query: str, params: Iterable) -> int:
+    cursor = conn.executemany(query, params)
+    try:
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def sqlite_executemany_returning(
+    conn: sqlite3.Connection, query: str, params: Iterable
+) -> tuple[list, Any]:
+    """Return rows of RETURNING (with a description) or generated keys."""
+    returning = RE_RETURNING.search(query) is not None
+    rows: list = []
+    description = None
+    for args in params:
+        cursor = conn.execute(query, args)
+        try:
+            if returning:
+                rows.extend(cursor.fetchall())
+                description = cursor.description
+            else:
+                rows.append(cursor.lastrowid)
+        finally:
+            cursor.close()
+    return rows, description
+
+
+def sqlite_batch(conn: sqlite3.Connection, statements: tuple) -> list[tuple[int, Any]]:
+    return [sqlite_execute(conn, query, tuple(params)) for query, *params in statements]
+
+
+def sqlite_fetch(
+    conn: sqlite3.Connection, query: str, params: tuple, size: int | None = None
+) -> tuple[list, Any]:
+    cursor = conn.execute(query, params)
+    try:
+        rows = cursor.fetchall() if size is None else cursor.fetchmany(size)
+        return rows, cursor.description
+    finally:
+        cursor.close()
+
+
+def sqlite_fetchmany(_: sqlite3.Connection, cursor: sqlite3.Cursor, size: int) -> list:
+    return cursor.fetchmany(size)
+
+
+def sqlite_close(_: sqlite3.Connection, cursor: sqlite3.Cursor):
+    cursor.close()
+
+
+class Connection(BaseConnection[aiosqlite.Connection]):
+    """Run every operation in a single hop to the aiosqlite worker thread."""
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """Call `func(sqlite3_connection, *args)` in the worker thread of the connection.
+
+        The function is called directly, nothing is logged and no lock is taken.
+        """
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("There is no an acquired connection")
+        return await conn._execute(func, conn._conn, *args)
+
+    async def batch(self, *statements: tuple) -> list[tuple[int, Any]]:
+        """Execute the given `(query, *params)` statements in a single hop.
+
+        Return a list of `(rowcount, lastrowid)` for the statements.
+        """
+        if self.read_only:
+            raise ReadOnlyError("Write operations are not allowed on read-only connections")
+
+        if self.pending:
+            await self.begin()
+
+        convert = self.backend.__convert_sql__
+        statements = tuple((convert(query), *params) for query, *params in statements)
+        self.logger.debug(statements)
+        async with self._lock:
+            return await self.run(sqlite_batch, statements)
+
+    async def _execute(self, query: str, *params, **_) -> tuple[int, Any]:
+        return await self.run(sqlite_execute, query, params)
+
+    async def _executemany(self, query: str, *params, **_) -> Any:
+        return await self.run(sqlite_executemany, query, params)
+
+    async def _executemany_returning(
+        self, query: str, *params, result: TResult | None = None, **_
+    ) -> list:
+        rows, description = await self.run(sqlite_executemany_returning, query, params)
+        if description is None:
+            return rows
+        factory = row_factory(result, description)
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchall(
+        self, query: str, *params, result: TResult | None = None, **_
+    ) -> list[TRecord]:
+        rows, description = await self.run(sqlite_fetch, query, params)
+        factory = row_factory(result, description)
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchall_limited(
+        self,
+        query: str,
+        *params,
+        result: TResult | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        **options,
+    ) -> list:
+        if max_bytes is not None or max_rows is None:
+            return await super(Connection, self)._fetchall_limited(
+                query, *params, result=result, max_rows=max_rows, max_bytes=max_bytes, **options
+            )
+
+        # Fetch one row over the limit in one hop
+        rows, description = await self.run(sqlite_fetch, query, params, max_rows + 1)
+        ResultGuard(max_rows).check(rows)
+        factory = row_factory(result, description)
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchmany(
+        self, size: int, query: str, *params, result: TResult | None = None, **_
+    ) -> list[TRecord]:
+        rows, description = await self.run(sqlite_fetch, query, params, size)
+        factory = row_factory(result, description)
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchone(
+        self, query: str, *params, result: TResult | None = None, **_
+    ) -> TRecord | None:
+        rows, description = await self.run(sqlite_fetch, query, params, 1)
+        if not rows:
+            return None
+        factory = row_factory(result, description)
+        return rows[0] if factory is None else factory(rows[0])
+
+    async def _fetchval(self, query: str, *params, column: Any = 0, **_) -> Any:
+        rows, _description = await self.run(sqlite_fetch, query, params, 1)
+        return rows[0][column] if rows else None
+
+    async def _iterate(
+        self, query: str, *params, result: TResult | None = None, chunk_size: int = 1000, **_
+    ) -> AsyncIterator[TRecord]:
+        cursor = await self.run(sqlite3.Connection.execute, query, params)
+        try:
+            factory = row_factory(result, cursor.description)
+            while True:
+                rows = await self.run(sqlite_fetchmany, cursor, chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row if factory is None else factory(row)
+        finally:
+            await self.run(sqlite_close, cursor)
+
+    async def _export(
+        self,
+        query: str,
+        fileobj: IO[str],
+        *params,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+        chunk_size: int = 1000,
+        **_,
+    ) -> int:
+        cursor = await self.run(sqlite3.Connection.execute, query, params)
+        try:
+            description = cursor.description
+            if description is None:
+                raise ValueError("The query does not return rows")
+
+            names = [d[0] for d in description]
+            writer, count = Writer(fileobj, names, format=format, header=header), 0
+            while True:
+                rows = await self.run(sqlite_fetchmany, cursor, chunk_size)
+                if not rows:
+                    break
+                writer.write(rows)
+                count += len(rows)
+
+            writer.flush()
+            return count
+        finally:
+            await self.run(sqlite_close, cursor)
 
 
 class Backend(ABCDatabaseBackend[aiosqlite.Connection]):
@@ -16,6 +266,14 @@ class Backend(ABCDatabaseBackend[aiosqlite.Connection]):
     db_type = "sqlite"
     connection_cls = Connection
 
+    # Keeps a shared in-memory database alive while the database is connected
+    keeper: aiosqlite.Connection | None = None
+    shared_memory: bool = False
+
+    # Codecs of the backend's connections
+    encoders: dict[type, Callable]
+    decoders: dict[str, Callable]
+
     def __init__(
         self,
         url,
@@ -25,7 +283,10 @@ class Backend(ABCDatabaseBackend[aiosqlite.Connection]):
         functions: tuple[tuple[str, int, Callable], ...] | None = None,
         **options,
     ):
-        """Set a default isolation level (enable autocommit). Fix in memory URL."""
+        """Set a default isolation level (enable autocommit). Fix in memory URL.
+
+        Support SQLite URI filenames: `sqlite:///file:name?mode=memory&cache=shared`
+        """
         if ":memory:" in url.path:
             url = url._replace(path="")
 
@@ -43,15 +304,74 @@ class Backend(ABCDatabaseBackend[aiosqlite.Connection]):
 
         super(Backend, self).__init__(url, isolation_level=isolation_level, init=init, **options)
 
+        self.database = url.path
+        if url.path.startswith("/file:"):
+            # Query params belong to the URI filename
+            query = parse_qsl(url.query)
+            for name, _ in query:
+                self.options.pop(name, None)
+
+            self.database = url.path[1:] + (f"?{url.query}" if url.query else "")
+            self.options["uri"] = True
+            self.shared_memory = ("mode", "memory") in query
+
+        self.encoders, self.decoders = {}, {}
+        if self.codecs:
+            self.setup_codecs()
+
+    def setup_codecs(self):
+        """Register the codecs for the backend's connections only.
+
+        sqlite3 adapters and converters are global, they dispatch values to the codecs of
+        the current connection (every aiosqlite connection has its own thread).
+        """
+        self.options.setdefault("detect_types", sqlite3.PARSE_DECLTYPES)
+        for codec in self.codecs:
+            if codec.decoder:
+                # sqlite3 matches converters case-insensitively
+                self.decoders[codec.typename.upper()] = codec.decoder
+            if codec.encoder and codec.python_type:
+                self.encoders[codec.python_type] = codec.encoder
+
+        sqlite_register_codecs(self.encoders, self.decoders)
+
     def __convert_sql__(self, sql: Any) -> str:
         sql = str(sql)
         if self.convert_params:
             sql = RE_PARAM.sub(r"\1?", sql)
         return sql
 
+    def placeholder(self, num: int) -> str:
+        return "?"
+
+    def is_transient(self, exc: BaseException) -> bool:
+        # SQLITE_BUSY, SQLITE_LOCKED
+        return isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc)
+
+    async def connect(self) -> None:
+        await super(Backend, self).connect()
+        if self.shared_memory and self.keeper is None:
+            self.keeper = await aiosqlite.connect(database=self.database, uri=True)
+
+    async def disconnect(self) -> None:
+        await super(Backend, self).disconnect()
+        keeper, self.keeper = self.keeper, None
+        if keeper is not None:
+            await keeper.close()
+
+    async def after_fork(self) -> None:
+        # The keeper's thread does not survive the fork
+        keeper, self.keeper = self.keeper, None
+        await super(Backend, self).after_fork()
+        if keeper is not None:
+            await self.connect()
+
     async def _acquire(self) -> aiosqlite.Connection:
-        return await aiosqlite.connect(database=self.url.path, **self.options)
+        conn = await aiosqlite.connect(database=self.database, **self.options)
+        if self.codecs:
+            await conn._execute(sqlite_set_codecs, self.encoders, self.decoders)
+        return conn
 
-    async def release(self, conn: aiosqlite.Connection):
+    async def _release(self, conn: aiosqlite.Connection):
         await conn.commit()
         await conn.close()
@@ -1,18 +1,87 @@
 from __future__ import annotations
 
+import asyncio
+from codecs import getincrementaldecoder
+from functools import lru_cache
 from json import dumps, loads
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, cast
+from uuid import uuid4
 
 import asyncpg
 
-from . import RE_PARAM, ABCConnection, ABCDatabaseBackend, ABCTransaction
-from .common import PGReplacer, pg_parse_status
+from aio_databases.record import model_factory
+
+from . import (
+    RE_PARAM,
+    ABCConnection,
+    ABCDatabaseBackend,
+    ABCListener,
+    ABCTransaction,
+    Notification,
+    ResultGuard,
+)
+from .common import (
+    RE_RETURNING,
+    PGReplacer,
+    is_cursor_query,
+    multirow_batches,
+    pg_parse_status,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Callable
+    from typing import IO
 
     from asyncpg.transaction import Transaction as AsyncPGTransaction
 
+    from aio_databases.export import TFormat
+    from aio_databases.types import TResult
+
+
+@lru_cache(maxsize=1024)
+def convert_params(sql: str) -> str:
+    """Replace `%s` placeholders with `$n` (results of the replacement are cached)."""
+    return RE_PARAM.sub(PGReplacer(), sql)
+
+
+# Bounded portals (a row limit on Execute) rely on the private `Connection._execute` of asyncpg,
+# it is used with the checked versions only
+ASYNCPG_VERSION = tuple(int(num) for num in asyncpg.__version__.split(".")[:2])
+BOUNDED_PORTALS = (0, 18) <= ASYNCPG_VERSION < (1, 0)
+
+
+async def pg_fetch_limited(conn: asyncpg.Connection, query: str, params: tuple, limit: int):
+    """Fetch up to `limit` rows, with a bounded portal when asyncpg allows it."""
+    if BOUNDED_PORTALS:
+        return await conn._execute(query, params, limit, None)
+
+    rows = await conn.fetch(query, *params)
+    return rows[:limit]
+
+
+async def skip_reset(conn: asyncpg.Connection):
+    """Do not reset session state on release, there is no session behind a pooler."""
+
+
+# asyncpg.Record is already a record (mapping), convert it only for tuples/dicts
+ROW_FACTORIES: dict[Any, Callable | None] = {
+    None: None,
+    "record": None,
+    "native": None,
+    "tuple": tuple,
+    "dict": dict,
+}
+
+
+def pg_row_factory(result: TResult | None, row: asyncpg.Record) -> Callable | None:
+    if isinstance(result, type):
+        return model_factory(result, tuple(row.keys()))
+
+    if result not in ROW_FACTORIES:
+        raise ValueError(f"Unsupported result format: {result}")
+
+    return ROW_FACTORIES[result]
+
 
 class Transaction(ABCTransaction[asyncpg.Connection]):
     _trans: AsyncPGTransaction | None = None
@@ -52,43 +121,221 @@ class Connection(ABCConnection[asyncpg.Connection]):
         assert conn is not None
         return await conn.executemany(query, params, **options)
 
-    async def _fetchall(self, query: str, *params, **options) -> list[asyncpg.Record]:
+    async def _executemany_returning(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list:
+        if not RE_RETURNING.search(query):
+            raise ValueError("PostgreSQL requires a RETURNING clause to return rows")
+
+        conn = self._conn
+        assert conn is not None
+        rows: list = []
+        for sql, args in multirow_batches(query, params):
+            batch = await conn.fetch(sql, *args, **options)
+            factory = pg_row_factory(result, batch[0]) if batch else None
+            rows.extend(batch if factory is None else map(factory, batch))
+        return rows
+
+    async def _fetchall(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list:
         conn = self._conn
         assert conn is not None
-        return await conn.fetch(query, *params, **options)
+        rows = await conn.fetch(query, *params, **options)
+        factory = pg_row_factory(result, rows[0]) if rows else None
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchall_limited(
+        self,
+        query: str,
+        *params,
+        result: TResult | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        **options,
+    ) -> list:
+        if max_bytes is not None or max_rows is None:
+            return await super(Connection, self)._fetchall_limited(
+                query, *params, result=result, max_rows=max_rows, max_bytes=max_bytes, **options
+            )
 
-    async def _fetchmany(self, size: int, query: str, *params, **_) -> list[asyncpg.Record]:
         conn = self._conn
         assert conn is not None
-        async with conn.transaction():
-            cur = await conn.cursor(query, *params)
-            return await cur.fetch(size)
+        # Fetch one row over the limit with a bounded portal
+        rows = await pg_fetch_limited(conn, query, params, max_rows + 1)
+        ResultGuard(max_rows).check(rows)
+        factory = pg_row_factory(result, rows[0]) if rows else None
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchmany(
+        self, size: int, query: str, *params, result: TResult | None = None, **_
+    ) -> list:
+        conn = self._conn
+        assert conn is not None
+        # Bounded portal execution, there is no need in a transaction and a cursor
+        rows = await pg_fetch_limited(conn, query, params, size)
+        factory = pg_row_factory(result, rows[0]) if rows else None
+        return rows if factory is None else list(map(factory, rows))
 
-    async def _fetchone(self, query: str, *params, **options) -> asyncpg.Record | None:
+    async def _fetchone(self, query: str, *params, result: TResult | None = None, **options):
         conn = self._conn
         assert conn is not None
-        return await conn.fetchrow(query, *params, **options)
+        row = await conn.fetchrow(query, *params, **options)
+        factory = pg_row_factory(result, row) if row is not None else None
+        return row if factory is None else factory(row)
 
     async def _fetchval(self, query: str, *params, column: Any = 0, **options) -> Any:
         conn = self._conn
         assert conn is not None
         return await conn.fetchval(query, *params, column=column, **options)
 
-    async def _iterate(self, query: str, *params, **_) -> AsyncIterator[asyncpg.Record]:
+    async def _iterate(
+        self, query: str, *params, result: TResult | None = None, prefetch: int | None = None, **_
+    ) -> AsyncIterator:
         conn = self._conn
         assert conn is not None
+        backend = cast("Backend", self.backend)
+        prefetch = prefetch or backend.prefetch
+
+        # asyncpg cursors use named statements which a pooler can route to another server
+        # connection, declare a cursor with SQL instead
+        cursor = self._cursor
+        if backend.pooler_mode:
+            if not is_cursor_query(query):
+                raise ValueError("Only SELECT queries can be iterated in pooler mode")
+            cursor = self._declared_cursor
+
+        # Cursors require a transaction, reuse the current one (if exists)
+        if conn.is_in_transaction():
+            async for rec in cursor(conn, query, params, result, prefetch):
+                yield rec
+            return
+
         async with conn.transaction():
-            async for rec in conn.cursor(query, *params):
+            async for rec in cursor(conn, query, params, result, prefetch):
                 yield rec
 
+    @staticmethod
+    async def _cursor(
+        conn: asyncpg.Connection,
+        query: str,
+        params: tuple,
+        result: TResult | None,
+        prefetch: int | None,
+    ) -> AsyncIterator:
+        factory, first = None, True
+        async for rec in conn.cursor(query, *params, prefetch=prefetch):
+            if first:
+                factory, first = pg_row_factory(result, rec), False
+            yield rec if factory is None else factory(rec)
+
+    @staticmethod
+    async def _declared_cursor(
+        conn: asyncpg.Connection,
+        query: str,
+        params: tuple,
+        result: TResult | None,
+        prefetch: int | None,
+    ) -> AsyncIterator:
+        """Read a cursor declared with SQL by pages (in the transaction)."""
+        name = f"aiodb_{uuid4().hex}"
+        await conn.execute(f"DECLARE {name} NO SCROLL CURSOR FOR {query}", *params)
+        fetch = f"FETCH FORWARD {prefetch or 50} FROM {name}"
+        factory, first = None, True
+        while rows := await conn.fetch(fetch):
+            if first:
+                factory, first = pg_row_factory(result, rows[0]), False
+            for rec in rows:
+                yield rec if factory is None else factory(rec)
+
+        await conn.execute(f"CLOSE {name}")
+
+    async def _export(
+        self,
+        query: str,
+        fileobj: IO[str],
+        *params,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+        **options,
+    ) -> int:
+        if format != "csv":
+            return await super()._export(
+                query, fileobj, *params, format=format, header=header, **options
+            )
+
+        conn = self._conn
+        assert conn is not None
+        decode = getincrementaldecoder("utf-8")().decode
+
+        async def output(chunk: bytes):
+            fileobj.write(decode(chunk))
+
+        status = await conn.copy_from_query(
+            query, *params, output=output, format="csv", header=header, **options
+        )
+        return int(status.split()[-1])
+
+
+class Listener(ABCListener[asyncpg.Connection]):
+    async def _connect(self) -> asyncpg.Connection:
+        backend = cast("Backend", self.backend)
+        if backend.pooler_mode:
+            raise RuntimeError("LISTEN requires a session, it is not supported in pooler mode")
+
+        # A dedicated connection, outside of a pool
+        return await Backend._acquire(backend)
+
+    async def _close(self, conn: asyncpg.Connection):
+        await conn.close()
+
+    async def _listen(self, conn: asyncpg.Connection, channel: str):
+        await conn.add_listener(channel, self.notify)
+
+    async def _unlisten(self, conn: asyncpg.Connection, channel: str):
+        await conn.remove_listener(channel, self.notify)
+
+    async def _wait(self, conn: asyncpg.Connection):
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        if not conn.is_closed():
+            await lost.wait()
+
+    def notify(self, _: Any, pid: int, channel: str, payload: str):
+        self.dispatch(Notification(channel, payload, pid))
+
 
 class Backend(ABCDatabaseBackend[asyncpg.Connection]):
     name = "asyncpg"
     db_type = "postgresql"
     connection_cls = Connection
-
-    def __init__(self, url, *, json=False, **kwargs):
+    listener_cls = Listener
+
+    # A number of rows to prefetch by cursors and the pooler mode (see `__init__`)
+    prefetch: int | None
+    pooler_mode: bool
+
+    def __init__(
+        self,
+        url,
+        *,
+        json=False,
+        prefetch: int | None = None,
+        pooler_mode: bool = False,
+        **kwargs,
+    ):
+        """
+        :param prefetch: A number of rows to prefetch by cursors (iterate)
+        :param pooler_mode: Work behind a transaction-mode pooler (PgBouncer): use unnamed
+            statements and do not rely on session state
+        """
         super(Backend, self).__init__(url, **kwargs)
+        self.prefetch = prefetch
+        self.pooler_mode = pooler_mode
+        if pooler_mode:
+            # Named prepared statements are bound to a server connection
+            self.options["statement_cache_size"] = 0
+
         url = self.url
         self.options["host"] = url.hostname
         self.options["port"] = url.port
@@ -96,24 +343,53 @@ class Backend(ABCDatabaseBackend[asyncpg.Connection]):
         self.options["password"] = url.password
         self.options["database"] = url.path.strip("/")
         if json:
-            self.init = asyncpg_init_json
+            self.codecs.json()
+
+        # Binary values can not be passed through as text
+        for codec in self.codecs:
+            if codec.format == "binary" and not (codec.encoder and codec.decoder):
+                raise ValueError(
+                    f"Binary codec {codec.typename!r} requires an encoder and a decoder"
+                )
 
     def __convert_sql__(self, sql: Any) -> str:
         sql = str(sql)
         if self.convert_params:
-            sql = RE_PARAM.sub(PGReplacer(), sql)
+            sql = convert_params(sql)
 
         return sql
 
+    def placeholder(self, num: int) -> str:
+        return f"${num}"
+
+    def is_transient(self, exc: BaseException) -> bool:
+        return isinstance(exc, (asyncpg.SerializationError, asyncpg.DeadlockDetectedError))
+
+    async def setup_codecs(self, conn: asyncpg.Connection):
+        """Install the codecs into a new connection. Text codecs pass missing sides as text."""
+        for codec in self.codecs:
+            await conn.set_type_codec(
+                codec.typename,
+                encoder=codec.encoder or str,
+                decoder=codec.decoder or str,
+                schema=codec.schema,
+                format=codec.format,
+            )
+
     async def _acquire(self) -> asyncpg.Connection:
-        return await asyncpg.connect(**self.options)
+        conn = await asyncpg.connect(**self.options)
+        if self.codecs:
+            await self.setup_codecs(conn)
+        return conn
 
-    async def release(self, conn: asyncpg.Connection):
+    async def _release(self, conn: asyncpg.Connection):
         await conn.close()
 
 
 class PoolBackend(Backend):
     name = "asyncpg+pool"
+    pooled = True
+    pool_size_options = ("min_size", "max_size")
     _pool: asyncpg.Pool | None = None
 
     def __init__(self, *args, **kwargs):
@@ -126,13 +402,37 @@ class PoolBackend(Backend):
                 "max_queries",
                 "max_inactive_connection_lifetime",
                 "setup",
-                "init",
+                "reset",
             )
             if name in self.options
         }
 
     async def connect(self) -> None:
-        self.pool = await asyncpg.create_pool(**self.options, **self.pool_options)
+        pool_options: dict[str, Any] = dict(self.pool_options)
+        if self.pooler_mode:
+            pool_options.setdefault("reset", skip_reset)
+
+        self.pool = await asyncpg.create_pool(
+            init=self.setup_connection, **self.options, **pool_options
+        )
+
+    async def setup_connection(self, conn: asyncpg.Connection):
+        """Setup a new connection of the pool. Codecs are installed once per a connection."""
+        self.metrics["connections_created"] += 1
+        if self.codecs:
+            await self.setup_codecs(conn)
+
+    def pool_stats(self) -> dict[str, Any]:
+        pool = self.pool
+        size = pool.get_size()
+        created = self.metrics["connections_created"]
+        return {
+            "open": size,
+            "idle": pool.get_idle_size(),
+            "max_size": pool.get_max_size(),
+            "created": created,
+            "closed": created - size,
+        }
 
     async def disconnect(self) -> None:
         await self.pool.close()
@@ -140,7 +440,7 @@ class PoolBackend(Backend):
     async def _acquire(self) -> asyncpg.Connection:
         return await self.pool.acquire()
 
-    async def release(self, conn: asyncpg.Connection):
+    async def _release(self, conn: asyncpg.Connection):
         await self.pool.release(conn)
 
 
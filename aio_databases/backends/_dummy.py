@@ -46,5 +46,5 @@ class Backend(ABCDatabaseBackend):
     async def _acquire(self):
         pass
 
-    async def release(self, conn):
+    async def _release(self, conn):
         pass
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from itertools import count
+from math import log
+from random import expovariate, lognormvariate, random, uniform
+from typing import TYPE_CHECKING, Any
+
+from aio_databases.record import row_factory
+
+from . import ABCConnection, ABCDatabaseBackend
+from .common import Transaction
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Sequence
+
+    from aio_databases.types import TRecord, TResult
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class SimulatedError(RuntimeError):
+    """An injected error."""
+
+
+class SimulatedTransientError(SimulatedError):
+    """An injected transient error (a serialization failure, a deadlock)."""
+
+
+class Connection(ABCConnection):
+    transaction_cls = Transaction
+
+    async def _execute(self, query: str, *params, **options) -> Any:
+        backend: Backend = self.backend  # type: ignore[bad-assignment]
+        await backend.simulate()
+        return 1, next(backend.ids)
+
+    async def _executemany(self, query: str, *params, **options) -> Any:
+        backend: Backend = self.backend  # type: ignore[bad-assignment]
+        await backend.simulate()
+
+    async def _fetchall(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list:
+        backend: Backend = self.backend  # type: ignore[bad-assignment]
+        await backend.simulate()
+        description, rows = backend.get_results(query)
+        factory = row_factory(result, description)
+        return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchmany(
+        self, size: int, query: str, *params, result: TResult | None = None, **options
+    ) -> list[TRecord]:
+        rows = await self._fetchall(query, *params, result=result, **options)
+        return rows[:size]
+
+    async def _fetchone(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> TRecord | None:
+        rows = await self._fetchall(query, *params, result=result, **options)
+        return rows[0] if rows else None
+
+    async def _fetchval(self, query: str, *params, column: Any = 0, **options) -> Any:
+        rows = await self._fetchall(query, *params, result="tuple", **options)
+        return rows[0][column] if rows else None
+
+    async def _iterate(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> AsyncIterator[TRecord]:
+        for row in await self._fetchall(query, *params, result=result, **options):
+            yield row
+
+
+class Backend(ABCDatabaseBackend):
+    """A stand-in backend to model latency and contention (asyncio only).
+
+    Options can be given as URL params: `simulated://?latency=0.005&pool_size=10&rows=100`
+
+    :param latency: Mean latency of a query (seconds)
+    :param distribution: Latency distribution (fixed, uniform, exponential, lognormal)
+    :param sigma: Sigma of the lognormal distribution
+    :param connect_latency: Latency of opening a connection
+    :param pool_size: Number of connections in the simulated pool (0 - unlimited)
+    :param rows: Number of rows in results
+    :param columns: Number of columns in results
+    :param results: Scripted results: {query: (columns names, rows)}
+    :param error_rate: Probability of an error per query
+    :param transient: Inject transient errors (retried by transactions)
+    """
+
+    name = "simulated"
+    db_type = "simulated"
+    connection_cls = Connection
+    pooled = True
+
+    _pool: asyncio.Semaphore | None = None
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url,
+        *,
+        latency: float = 0.0,
+        distribution: str = "fixed",
+        sigma: float = 0.5,
+        connect_latency: float = 0.0,
+        pool_size: int = 10,
+        rows: int = 1,
+        columns: int = 1,
+        results: dict[str, tuple[Sequence[str], list[tuple]]] | None = None,
+        error_rate: float = 0.0,
+        transient: bool = False,
+        **options,
+    ):
+        super(Backend, self).__init__(url, **options)
+        params = self.options
+        self.latency = float(params.pop("latency", latency))
+        self.distribution = params.pop("distribution", distribution)
+        self.sigma = float(params.pop("sigma", sigma))
+        self.connect_latency = float(params.pop("connect_latency", connect_latency))
+        self.pool_size = int(params.pop("pool_size", pool_size))
+        self.error_rate = float(params.pop("error_rate", error_rate))
+        self.transient = str(params.pop("transient", transient)).lower() in {"1", "true"}
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unsupported distribution: {self.distribution}")
+
+        rows, columns = int(params.pop("rows", rows)), int(params.pop("columns", columns))
+        names = [f"col{num}" for num in range(columns)]
+        self.default_results = (
+            [(name,) for name in names],
+            [tuple(range(num, num + columns)) for num in range(rows)],
+        )
+        self.results = {
+            query: ([(name,) for name in result_names], result_rows)
+            for query, (result_names, result_rows) in (results or {}).items()
+        }
+        self.ids = count(1)
+
+    def is_transient(self, exc: BaseException) -> bool:
+        return isinstance(exc, SimulatedTransientError)
+
+    def get_latency(self) -> float:
+        latency, distribution = self.latency, self.distribution
+        if not latency or distribution == "fixed":
+            return latency
+        if distribution == "uniform":
+            return uniform(0, 2 * latency)  # noqa: S311
+        if distribution == "exponential":
+            return expovariate(1 / latency)
+        sigma = self.sigma
+        return lognormvariate(log(latency) - sigma**2 / 2, sigma)
+
+    async def simulate(self):
+        """Wait for a query's latency and inject errors."""
+        await asyncio.sleep(self.get_latency())
+        if self.error_rate and random() < self.error_rate:  # noqa: S311
+            if self.transient:
+                raise SimulatedTransientError("Simulated transient error")
+            raise SimulatedError("Simulated error")
+
+    def get_results(self, query: str) -> tuple[list[tuple], list[tuple]]:
+        return self.results.get(query, self.default_results)
+
+    def pool_stats(self) -> dict[str, Any]:
+        return {
+            "open": self.pool_size,
+            "idle": self.pool_size - self.in_use,
+            "max_size": self.pool_size,
+            "created": self.pool_size,
+            "closed": 0,
+        }
+
+    async def connect(self) -> None:
+        await super(Backend, self).connect()
+        if self.pool_size:
+            self.pool = asyncio.Semaphore(self.pool_size)
+
+    async def disconnect(self) -> None:
+        await super(Backend, self).disconnect()
+        self.pool = None
+
+    async def _acquire(self):
+        pool = self._pool
+        if pool is not None:
+            await pool.acquire()
+
+        try:
+            await asyncio.sleep(self.connect_latency)
+        except BaseException:
+            if pool is not None:
+                pool.release()
+            raise
+
+        return object()
+
+    async def _release(self, conn):
+        if self._pool is not None:
+            self._pool.release()
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
 import trio
 import trio_mysql
+from trio_mysql import converters
+from trio_mysql.constants import FIELD_TYPE
+from trio_mysql.cursors import SSCursor
+from trio_mysql.err import MySQLError
+
+from aio_databases.log import logger as base_logger
 
 from . import ABCDatabaseBackend
+from .common import MYSQL_TRANSIENT_ERRORS, mysql_conv
 from .common import Connection as Connection_
 
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Awaitable, Callable
+
 
 class Connection(Connection_[trio_mysql.Connection]):
     lock_cls = trio.Lock  # type: ignore[assignment]
+    sleep = staticmethod(trio.sleep)
+    stream_cursor_cls = SSCursor
 
 
 class Backend(ABCDatabaseBackend[trio_mysql.Connection]):
@@ -21,8 +37,21 @@ class Backend(ABCDatabaseBackend[trio_mysql.Connection]):
         super(Backend, self).__init__(
             *args, autocommit=autocommit, charset=charset, use_unicode=use_unicode, **options
         )
+        if self.codecs:
+            self.options["conv"] = mysql_conv(self.codecs, converters, FIELD_TYPE)
+
+    def is_transient(self, exc: BaseException) -> bool:
+        if isinstance(exc, MySQLError) and exc.args:
+            return exc.args[0] in MYSQL_TRANSIENT_ERRORS
+        return False
 
     async def _acquire(self) -> trio_mysql.Connection:
+        return await self._connect()
+
+    async def _release(self, conn: trio_mysql.Connection):
+        conn.close()
+
+    async def _connect(self) -> trio_mysql.Connection:
         conn = trio_mysql.connect(
             **self.options,
             host=self.url.hostname,
@@ -34,5 +63,189 @@ class Backend(ABCDatabaseBackend[trio_mysql.Connection]):
         await conn.connect()
         return conn
 
+
+class Pool:
+    """A pool of trio-mysql connections built on trio primitives.
+
+    :param connect: A function to open a new connection
+    :param minsize: Number of connections opened on start
+    :param maxsize: Maximum number of connections
+    :param pool_recycle: Close connections idle for more than the given seconds (-1 to disable)
+    :param nursery: A nursery to run the reaper of idle connections in (a system task by default)
+    :param logger: A logger for errors of the reaper
+    """
+
+    __slots__ = (
+        "closed",
+        "connect",
+        "created",
+        "free",
+        "lock",
+        "logger",
+        "maxsize",
+        "minsize",
+        "nursery",
+        "pool_recycle",
+        "reaper",
+        "semaphore",
+        "size",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        connect: Callable[[], Awaitable[trio_mysql.Connection]],
+        *,
+        minsize: int = 1,
+        maxsize: int = 10,
+        pool_recycle: float = -1,
+        nursery: trio.Nursery | None = None,
+        logger: logging.Logger = base_logger,
+    ):
+        if not 0 <= minsize <= maxsize:
+            raise ValueError("minsize should be zero or greater, and not more than maxsize")
+
+        self.connect = connect
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.pool_recycle = pool_recycle
+        self.nursery = nursery
+        self.logger = logger
+        self.closed = False
+        self.size = 0
+        self.created = 0
+        self.lock = trio.Lock()
+        self.semaphore = trio.Semaphore(maxsize)
+        self.free: deque[tuple[trio_mysql.Connection, float]] = deque()
+        self.reaper: trio.CancelScope | None = None
+
+    @property
+    def freesize(self) -> int:
+        return len(self.free)
+
+    async def start(self) -> Pool:
+        """Open `minsize` connections and start a reaper of idle connections."""
+        async with self.lock:
+            while self.size < self.minsize:
+                conn = await self.connect()
+                self.size += 1
+                self.created += 1
+                self.free.append((conn, trio.current_time()))
+
+        if self.pool_recycle > 0:
+            self.reaper = trio.CancelScope()
+            if self.nursery is None:
+                trio.lowlevel.spawn_system_task(self.reap, self.reaper)
+            else:
+                self.nursery.start_soon(self.reap, self.reaper)
+
+        return self
+
+    async def acquire(self) -> trio_mysql.Connection:
+        if self.closed:
+            raise RuntimeError("The pool is closed")
+
+        await self.semaphore.acquire()
+        try:
+            async with self.lock:
+                self.expire()
+                if self.free:
+                    return self.free.pop()[0]
+
+                # Reserve a place, the semaphore bounds the size
+                self.size += 1
+
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+        try:
+            conn = await self.connect()
+        except BaseException:
+            self.size -= 1
+            self.semaphore.release()
+            raise
+
+        self.created += 1
+        return conn
+
     async def release(self, conn: trio_mysql.Connection):
-        conn.close()
+        try:
+            if self.closed or not conn.open:
+                self.size -= 1
+                conn.close()
+            else:
+                self.free.append((conn, trio.current_time()))
+        finally:
+            self.semaphore.release()
+
+    def expire(self):
+        """Close connections which have been idle for more than `pool_recycle`."""
+        if self.pool_recycle < 0:
+            return
+
+        deadline = trio.current_time() - self.pool_recycle
+        free = self.free
+        while free and free[0][1] < deadline:
+            conn, _ = free.popleft()
+            self.size -= 1
+            conn.close()
+
+    async def reap(self, scope: trio.CancelScope):
+        with scope:
+            while True:
+                await trio.sleep(self.pool_recycle / 2)
+                try:
+                    self.expire()
+                except Exception:
+                    self.logger.exception("Closing idle connections failed")
+
+    async def close(self):
+        self.closed = True
+        if self.reaper is not None:
+            self.reaper.cancel()
+
+        async with self.lock:
+            while self.free:
+                conn, _ = self.free.pop()
+                self.size -= 1
+                await conn.aclose()
+
+
+class PoolBackend(Backend):
+    name = "trio-mysql+pool"
+    pooled = True
+    pool_size_options = ("minsize", "maxsize")
+
+    _pool: Pool | None = None
+
+    def __init__(self, *args, **kwargs):
+        super(PoolBackend, self).__init__(*args, **kwargs)
+        self.pool_options = {
+            name: self.options.pop(name)
+            for name in ("minsize", "maxsize", "pool_recycle", "nursery")
+            if name in self.options
+        }
+
+    async def connect(self) -> None:
+        await super(PoolBackend, self).connect()
+        self.pool = await Pool(self._connect, **self.pool_options, logger=self.logger).start()
+
+    async def disconnect(self) -> None:
+        await super(PoolBackend, self).disconnect()
+        await self.pool.close()
+
+    async def _acquire(self) -> trio_mysql.Connection:
+        return await self.pool.acquire()
+
+    async def _release(self, conn: trio_mysql.Connection):
+        await self.pool.release(conn)
+
+    def pool_stats(self) -> dict[str, Any]:
+        pool = self.pool
+        return {
+            "open": pool.size,
+            "idle": pool.freesize,
+            "max_size": pool.maxsize,
+            "created": pool.created,
+            "closed": pool.created - pool.size,
+        }
@@ -1,17 +1,46 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from contextlib import asynccontextmanager
+from re import DOTALL, IGNORECASE
+from re import compile as re
+from typing import TYPE_CHECKING, Any, ClassVar
 from uuid import uuid4
 
-from aio_databases.record import Record
+from aio_databases.export import Writer
+from aio_databases.record import row_factory
 from aio_databases.types import TVConnection
 
-from . import ABCConnection, ABCTransaction
+from . import ABCConnection, ABCTransaction, ResultGuard
+
+# serialization_failure, deadlock_detected
+PG_TRANSIENT_ERRORS = frozenset({"40001", "40P01"})
+
+# ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK
+MYSQL_TRANSIENT_ERRORS = frozenset({1205, 1213})
+
+# The maximum number of params in a PostgreSQL query
+PG_MAX_PARAMS = 32767
+
+RE_RETURNING = re(r"\bRETURNING\b", IGNORECASE)
+RE_VALUES = re(r"\bVALUES\s*(\((?:[^()]|\([^()]*\))*\))", IGNORECASE)
+RE_PG_PARAM = re(r"\$(\d+)")
+
+# PostgreSQL queries which can be declared as cursors (after comments and parentheses)
+RE_CURSOR_QUERY = re(
+    r"^(?:\s+|--[^\n]*|/\*.*?\*/|\()*(SELECT|VALUES|TABLE|WITH)\b", IGNORECASE | DOTALL
+)
+RE_MODIFYING = re(
+    r"\b(INSERT\s+INTO|UPDATE\s+[\w.\"]+\s+SET|DELETE\s+FROM|MERGE\s+INTO)\b", IGNORECASE
+)
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Iterator, Sequence
+    from types import ModuleType
+    from typing import IO
 
-    from aio_databases.types import TRecord
+    from aio_databases.codecs import Codecs
+    from aio_databases.export import TFormat
+    from aio_databases.types import TRecord, TResult
 
 
 class Transaction(ABCTransaction):
@@ -45,6 +74,25 @@ class Transaction(ABCTransaction):
 class Connection(ABCConnection[TVConnection]):
     transaction_cls = Transaction
 
+    # A cursor class to read results without buffering them on the client (MySQL)
+    stream_cursor_cls: ClassVar[Any] = None
+
+    @asynccontextmanager
+    async def _stream(self, query: str, params: tuple, **options) -> AsyncIterator[Any]:
+        """Execute the query and get a cursor to read its result by chunks (`fetchmany`).
+
+        Default cursors of aiomysql/trio-mysql/aiopg buffer a whole result on execute,
+        MySQL backends use unbuffered cursors (`stream_cursor_cls`) and aiopg declares
+        a server-side cursor instead.
+        """
+        conn = self._conn
+        assert conn is not None
+        cursor_cls = self.stream_cursor_cls
+        cursor_ctx = conn.cursor(cursor_cls) if cursor_cls else conn.cursor()  # type: ignore[missing-attribute]
+        async with cursor_ctx as cursor:
+            await cursor.execute(query, params, **options)
+            yield cursor
+
     async def _execute(self, query: str, *params, **options) -> tuple[int, Any]:
         conn = self._conn
         assert conn is not None
@@ -58,25 +106,81 @@ class Connection(ABCConnection[TVConnection]):
         async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
             await cursor.executemany(query, params, **options)
 
-    async def _fetchall(self, query: str, *params, **options) -> list[TRecord]:
+    async def _executemany_returning(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list:
+        conn = self._conn
+        assert conn is not None
+        async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
+            if RE_RETURNING.search(query):
+                rows: list = []
+                for sql, args in multirow_batches(query, params):
+                    await cursor.execute(sql, args, **options)
+                    batch = await cursor.fetchall()
+                    factory = row_factory(result, cursor.description)
+                    rows.extend(batch if factory is None else map(factory, batch))
+                return rows
+
+            if self.backend.db_type == "postgresql":
+                raise ValueError("PostgreSQL requires a RETURNING clause to return rows")
+
+            # Generated keys of a multi-row insert are not always consecutive, insert row by row
+            keys: list = []
+            for args in params:
+                await cursor.execute(query, args, **options)
+                if cursor.lastrowid is None:
+                    raise ValueError("The driver does not support generated keys")
+                keys.append(cursor.lastrowid)
+            return keys
+
+    async def _fetchall(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> list[TRecord]:
         conn = self._conn
         assert conn is not None
         async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
             await cursor.execute(query, params, **options)
             rows = await cursor.fetchall()
-            desc = cursor.description
-            return [Record(row, desc) for row in rows]
+            factory = row_factory(result, cursor.description)
+            return rows if factory is None else list(map(factory, rows))
+
+    async def _fetchall_limited(
+        self,
+        query: str,
+        *params,
+        result: TResult | None = None,
+        max_rows: int | None = None,
+        max_bytes: int | None = None,
+        chunk_size: int = 1000,
+        **options,
+    ) -> list:
+        """Read the result by chunks from an unbuffered cursor (see `_stream`)."""
+        if max_rows is not None:
+            chunk_size = min(chunk_size, max_rows + 1)
+
+        guard, rows = ResultGuard(max_rows, max_bytes), []
+        async with self._stream(query, params, **options) as cursor:
+            while chunk := await cursor.fetchmany(chunk_size):
+                guard.check(chunk)
+                rows.extend(chunk)
+
+            factory = row_factory(result, cursor.description)
+            return rows if factory is None else list(map(factory, rows))
 
-    async def _fetchmany(self, size: int, query: str, *params, **options) -> list[TRecord]:
+    async def _fetchmany(
+        self, size: int, query: str, *params, result: TResult | None = None, **options
+    ) -> list[TRecord]:
         conn = self._conn
         assert conn is not None
         async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
             await cursor.execute(query, params, **options)
             rows = await cursor.fetchmany(size)
-            desc = cursor.description
-            return [Record(row, desc) for row in rows]
+            factory = row_factory(result, cursor.description)
+            return rows if factory is None else list(map(factory, rows))
 
-    async def _fetchone(self, query: str, *params, **options) -> TRecord | None:
+    async def _fetchone(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> TRecord | None:
         conn = self._conn
         assert conn is not None
         async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
@@ -84,7 +188,8 @@ class Connection(ABCConnection[TVConnection]):
             row = await cursor.fetchone()
             if row is None:
                 return row
-            return Record(row, cursor.description)
+            factory = row_factory(result, cursor.description)
+            return row if factory is None else factory(row)
 
     async def _fetchval(self, query: str, *params, column: Any = 0, **options) -> Any:
         conn = self._conn
@@ -96,17 +201,91 @@ class Connection(ABCConnection[TVConnection]):
                 return row
             return row[column]
 
-    async def _iterate(self, query: str, *params, **options) -> AsyncIterator[Record]:
+    async def _iterate(
+        self, query: str, *params, result: TResult | None = None, **options
+    ) -> AsyncIterator[TRecord]:
         conn = self._conn
         assert conn is not None
         async with conn.cursor() as cursor:  # type: ignore[missing-attribute]
             await cursor.execute(query, params, **options)
-            desc = cursor.description
+            factory = row_factory(result, cursor.description)
             while True:
                 row = await cursor.fetchone()
                 if row is None:
                     break
-                yield Record(row, desc)
+                yield row if factory is None else factory(row)
+
+    async def _export(
+        self,
+        query: str,
+        fileobj: IO[str],
+        *params,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+        chunk_size: int = 1000,
+        **options,
+    ) -> int:
+        async with self._stream(query, params, **options) as cursor:
+            description = cursor.description
+            if description is None:
+                raise ValueError("The query does not return rows")
+
+            names = [d[0] for d in description]
+            writer, count = Writer(fileobj, names, format=format, header=header), 0
+            while True:
+                rows = await cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                writer.write(rows)
+                count += len(rows)
+
+            writer.flush()
+            return count
+
+
+def expand_values(query: str, size: int, num_params: int) -> str:
+    """Expand `VALUES (...)` of the query into the given number of rows.
+
+    Numbered params ($1, $2) are renumbered for every row, so they are supported only inside
+    the group (e.g. not in ON CONFLICT ... DO UPDATE or RETURNING).
+    """
+    match = RE_VALUES.search(query)
+    if match is None:
+        raise ValueError("Only INSERT ... VALUES (...) queries are supported")
+
+    start, end = match.span(1)
+    if RE_PG_PARAM.search(query, 0, start) or RE_PG_PARAM.search(query, end):
+        raise ValueError("Numbered params are supported only inside VALUES (...)")
+
+    group = match.group(1)
+    rows = ", ".join(
+        RE_PG_PARAM.sub(lambda m, num=num: f"${int(m.group(1)) + num}", group)
+        for num in range(0, size * num_params, num_params)
+    )
+    return f"{query[:start]}{rows}{query[end:]}"
+
+
+def is_cursor_query(query: str) -> bool:
+    """Check the query can be declared as a PostgreSQL cursor.
+
+    DECLARE does not accept data-modifying statements in WITH.
+    """
+    match = RE_CURSOR_QUERY.match(query)
+    if match is None:
+        return False
+    return match.group(1).upper() != "WITH" or RE_MODIFYING.search(query) is None
+
+
+def multirow_batches(query: str, params: Sequence[Sequence]) -> Iterator[tuple[str, list]]:
+    """Split the params into multi-row queries (a query and flat params per batch)."""
+    if not params:
+        return
+
+    num_params = len(params[0]) or 1
+    size = max(1, PG_MAX_PARAMS // num_params)
+    for idx in range(0, len(params), size):
+        batch = params[idx : idx + size]
+        yield expand_values(query, len(batch), num_params), [arg for row in batch for arg in row]
 
 
 class PGReplacer:
@@ -130,3 +309,21 @@ def pg_parse_status(status: str) -> str | tuple[int, Any]:
         return int(params.split()[0]), None
 
     return status
+
+
+def mysql_conv(codecs: Codecs, converters: ModuleType, field_types: Any) -> dict:
+    """Build conversions for MySQL connections. Encoders have to return strings."""
+    escape_str = converters.escape_str
+    conv = dict(converters.conversions)
+    for codec in codecs:
+        field_type = getattr(field_types, codec.typename.upper(), None)
+        if codec.decoder and field_type is not None:
+            conv[field_type] = codec.decoder
+
+        if codec.encoder and codec.python_type:
+            encoder = codec.encoder
+            conv[codec.python_type] = lambda value, mapping=None, encoder=encoder: escape_str(
+                encoder(value), mapping
+            )
+
+    return conv
@@ -0,0 +1,233 @@
+"""Capacity testing for a database URL.
+
+Run a workload through the `Database` API with a sweep of concurrency levels and report
+throughput, latency percentiles and pool wait times per step (asyncio only)::
+
+    python -m aio_databases.bench sqlite:///:memory: --read "select 1" --concurrency 1,8,32
+    python -m aio_databases.bench asyncpg+pool://localhost/db --workload workload.json
+
+A workload file is a JSON object::
+
+    {
+        "setup": ["create table if not exists bench (id serial, value text)"],
+        "reads": ["select * from bench order by id desc limit 10"],
+        "writes": [["insert into bench (value) values ($1)", "test"]],
+        "write_ratio": 0.1,
+        "teardown": ["drop table bench"]
+    }
+
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from random import choice, random
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .database import Database
+from .utils import percentile
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class Workload(NamedTuple):
+    reads: list[tuple]
+    writes: list[tuple]
+    write_ratio: float = 0.0
+    setup: tuple[tuple, ...] = ()
+    teardown: tuple[tuple, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Workload:
+        """Load a workload. Queries are strings or lists: [query, *params]."""
+
+        def parse(queries: list) -> list[tuple]:
+            return [(query,) if isinstance(query, str) else tuple(query) for query in queries]
+
+        workload = cls(
+            reads=parse(data.get("reads", [])),
+            writes=parse(data.get("writes", [])),
+            write_ratio=float(data.get("write_ratio", 0.0)),
+            setup=tuple(parse(data.get("setup", []))),
+            teardown=tuple(parse(data.get("teardown", []))),
+        )
+        if not (workload.reads or workload.writes):
+            raise ValueError("The workload has no queries")
+        return workload
+
+
+class Step(NamedTuple):
+    concurrency: int
+    queries: int
+    errors: int
+    duration: float
+    latencies: list[float]
+    waits: list[float]
+    error: BaseException | None = None
+
+    @property
+    def qps(self) -> float:
+        return self.queries / self.duration if self.duration else 0.0
+
+    def report(self) -> dict[str, Any]:
+        latencies, waits = sorted(self.latencies), sorted(self.waits)
+        return {
+            "concurrency": self.concurrency,
+            "queries": self.queries,
+            "errors": self.errors,
+            "qps": round(self.qps, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "wait_p50_ms": round(percentile(waits, 50) * 1000, 3),
+            "wait_p99_ms": round(percentile(waits, 99) * 1000, 3),
+            "error": f"{type(error).__name__}: {error}" if (error := self.error) else "",
+        }
+
+
+async def run_step(db: Database, workload: Workload, concurrency: int, duration: float) -> Step:
+    """Run the workload with the given number of workers for the given time."""
+    backend = db.backend
+    backend.acquire_waits.clear()
+    latencies: list[float] = []
+    counters = {"queries": 0, "errors": 0}
+    errors: list[BaseException] = []
+    reads, writes, write_ratio = workload.reads, workload.writes, workload.write_ratio
+
+    started = perf_counter()
+    deadline = started + duration
+
+    async def worker():
+        while perf_counter() < deadline:
+            write = bool(writes) and (not reads or random() < write_ratio)  # noqa: S311
+            query, *params = choice(writes if write else reads)  # noqa: S311
+            start = perf_counter()
+            try:
+                if write:
+                    await db.execute(query, *params)
+                else:
+                    await db.fetchall(query, *params)
+            except Exception as exc:  # noqa: BLE001
+                counters["errors"] += 1
+                if not errors:
+                    errors.append(exc)
+            else:
+                counters["queries"] += 1
+                latencies.append(perf_counter() - start)
+
+            # Let other workers run when queries do not yield (e.g. the dummy backend)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return Step(
+        concurrency,
+        counters["queries"],
+        counters["errors"],
+        perf_counter() - started,
+        latencies,
+        list(backend.acquire_waits),
+        errors[0] if errors else None,
+    )
+
+
+async def run(
+    url: str,
+    workload: Workload,
+    *,
+    concurrency: Sequence[int] = (1, 4, 16),
+    duration: float = 5.0,
+    **options,
+) -> list[Step]:
+    """Run the workload with a sweep of concurrency levels."""
+    async with Database(url, **options) as db:
+        for query, *params in workload.setup:
+            await db.execute(query, *params)
+
+        try:
+            return [await run_step(db, workload, num, duration) for num in concurrency]
+
+        finally:
+            for query, *params in workload.teardown:
+                await db.execute(query, *params)
+
+
+def format_table(reports: list[dict[str, Any]]) -> str:
+    columns = list(reports[0])
+    rows = [columns, *([str(report[name]) for name in columns] for report in reports)]
+    widths = [max(len(row[idx]) for row in rows) for idx in range(len(columns))]
+    return "\n".join(
+        "  ".join(value.rjust(width) for value, width in zip(row, widths, strict=True))
+        for row in rows
+    )
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m aio_databases.bench", description="Capacity testing for a database URL"
+    )
+    parser.add_argument("url", help="A database URL (any supported scheme)")
+    parser.add_argument("--workload", type=Path, help="A JSON file with a workload")
+    parser.add_argument("--read", action="append", default=[], help="A read query")
+    parser.add_argument("--write", action="append", default=[], help="A write query")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="A share of writes")
+    parser.add_argument("--setup", action="append", default=[], help="A query to run first")
+    parser.add_argument(
+        "--concurrency", default="1,4,16", help="Comma separated concurrency levels"
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per step")
+    parser.add_argument(
+        "--option",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="A database option (a JSON value), e.g. max_size=10",
+    )
+    parser.add_argument("--json", action="store_true", help="Print reports as JSON lines")
+    return parser.parse_args(argv)
+
+
+def parse_option(option: str) -> tuple[str, Any]:
+    name, _, value = option.partition("=")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    data: dict[str, Any] = {}
+    if args.workload:
+        data = json.loads(args.workload.read_text())
+
+    data.setdefault("reads", args.read)
+    data.setdefault("writes", args.write)
+    data.setdefault("write_ratio", args.write_ratio)
+    data.setdefault("setup", args.setup)
+    if not (data["reads"] or data["writes"]):
+        data["reads"] = ["SELECT 1"]
+
+    workload = Workload.from_dict(data)
+    concurrency = [int(num) for num in args.concurrency.split(",")]
+    options = dict(map(parse_option, args.option))
+    steps = asyncio.run(
+        run(args.url, workload, concurrency=concurrency, duration=args.duration, **options)
+    )
+
+    reports = [step.report() for step in steps]
+    if args.json:
+        for report in reports:
+            sys.stdout.write(json.dumps(report) + "\n")
+    else:
+        sys.stdout.write(format_table(reports) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from json import dumps, loads
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+class Codec(NamedTuple):
+    typename: str
+    encoder: Callable[[Any], Any] | None = None
+    decoder: Callable[[Any], Any] | None = None
+    python_type: type | None = None
+    format: Literal["text", "binary"] = "text"
+    schema: str = "pg_catalog"
+
+
+class Codecs:
+    """A registry of type codecs, it is installed once per a physical connection.
+
+    Support depends on a driver:
+
+    * asyncpg: encoders and decoders for any type, text or binary formats (binary codecs
+      require both)
+    * aiopg: decoders for any type, encoders for types with `python_type`
+    * aiomysql, trio-mysql: decoders by MySQL field types, encoders for types with `python_type`
+    * aiosqlite: decoders by declared column types, encoders for types with `python_type`
+    """
+
+    __slots__ = ("codecs",)
+
+    def __init__(self, *codecs: Codec):
+        self.codecs: dict[str, Codec] = {codec.typename: codec for codec in codecs}
+
+    def __iter__(self) -> Iterator[Codec]:
+        return iter(self.codecs.values())
+
+    def __len__(self) -> int:
+        return len(self.codecs)
+
+    def __contains__(self, typename: str) -> bool:
+        return typename in self.codecs
+
+    def register(self, typename: str, **params) -> Codecs:
+        """Register a codec for the given type name.
+
+        :param encoder: Convert python values into database values
+        :param decoder: Convert database values into python values
+        :param python_type: A python type to encode (when a driver selects encoders by types)
+        :param format: A format of database values (text, binary)
+        :param schema: A schema of the type (postgresql)
+        """
+        self.codecs[typename] = Codec(typename, **params)
+        return self
+
+    def json(self, *, encoder: Callable = dumps, decoder: Callable = loads) -> Codecs:
+        """Register JSON codecs (json, jsonb)."""
+        for typename in ("json", "jsonb"):
+            self.register(typename, encoder=encoder, decoder=decoder)
+        return self
@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 from contextvars import ContextVar
-from random import choice
+from functools import wraps
+from inspect import isawaitable
+from os import getpid
+from random import choice, uniform
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlsplit
 
-from .backends import BACKENDS, SHORTCUTS, ABCConnection, ABCDatabaseBackend, ABCTransaction
+from .backends import (
+    BACKENDS,
+    SHORTCUTS,
+    ABCConnection,
+    ABCDatabaseBackend,
+    ABCListener,
+    ABCTransaction,
+)
 from .log import logger
+from .record import convert_records
+from .shards import HashRing
 from .url import redact_url
+from .utils import chunked, is_stream
 
 if TYPE_CHECKING:
     import logging
-    from collections.abc import AsyncIterator
-
-    from .types import TRecord
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Sequence,
+    )
+    from os import PathLike
+    from typing import IO
+
+    from .backends import Notification
+    from .types import TRecord, TResult
 
 current_conn: ContextVar[ABCConnection | None] = ContextVar("current_conn", default=None)
 
@@ -22,6 +46,7 @@ class Database:
     url: str
     backend: ABCDatabaseBackend
     is_connected: bool = False
+    listener: ABCListener | None = None
 
     def __init__(
         self,
@@ -29,8 +54,15 @@ class Database:
         *,
         logger: logging.Logger = logger,
         replicas: list[str] | None = None,
+        shards: list[str] | None = None,
+        shard_router: Callable[[Any], int] | None = None,
         **options,
     ):
+        """
+        :param replicas: URLs of read-only replicas
+        :param shards: URLs of shards (primaries)
+        :param shard_router: A function to get a shard's index by a key (a hash ring by default)
+        """
         self.url = url
         self.logger = logger
         self.backend = self._create_backend(url, **options)
@@ -40,6 +72,14 @@ class Database:
             for replica_url in replicas:
                 self.replica_backends.append(self._create_backend(replica_url, **options))
 
+        self.shard_backends: list[ABCDatabaseBackend] = []
+        self.shards: list[DatabaseShard] = []
+        if shards:
+            for shard_url in shards:
+                self.shard_backends.append(self._create_backend(shard_url, **options))
+            self.shards = [DatabaseShard(self, backend) for backend in self.shard_backends]
+            self.shard_router = shard_router or HashRing(shards)
+
     def _create_backend(self, url: str, **options) -> ABCDatabaseBackend:
         parsed_url = urlsplit(url)
         scheme = parsed_url.scheme
@@ -52,6 +92,11 @@ class Database:
 
         return backend_cls(parsed_url, logger=self.logger, **options)
 
+    @property
+    def all_backends(self) -> list[ABCDatabaseBackend]:
+        """Get the primary, replica and shard backends."""
+        return [self.backend, *self.replica_backends, *self.shard_backends]
+
     @property
     def parsed_url(self):
         return self.backend.url
@@ -75,6 +120,15 @@ class Database:
                 )
                 await replica_backend.connect()
 
+            for shard_backend in self.shard_backends:
+                self.logger.info("Shard connect: %s", self._url_repr(shard_backend.url.geturl()))
+                await shard_backend.connect()
+
+            for backend in self.all_backends:
+                backend.pid = getpid()
+                if backend.autoscaler is not None:
+                    backend.autoscaler.start()
+
             self.is_connected = True
 
         return self
@@ -91,7 +145,15 @@ class Database:
             await cur_conn.release()
             current_conn.set(None)
 
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            await listener.close()
+
         if self.is_connected:
+            for backend in self.all_backends:
+                if backend.autoscaler is not None:
+                    await backend.autoscaler.stop()
+
             await self.backend.disconnect()
             for replica_backend in self.replica_backends:
                 self.logger.info(
@@ -99,6 +161,10 @@ class Database:
                 )
                 await replica_backend.disconnect()
 
+            for shard_backend in self.shard_backends:
+                self.logger.info("Shard disconnect: %s", self._url_repr(shard_backend.url.geturl()))
+                await shard_backend.disconnect()
+
             self.is_connected = False
 
     __aexit__ = disconnect
@@ -107,10 +173,40 @@ class Database:
     def current_conn(self) -> ABCConnection | None:
         return current_conn.get()
 
-    def connection(self, *, create: bool = True, **params) -> ConnectionContext:
-        """Get/create a connection from/to the current context."""
+    def stats(self) -> dict[str, Any]:
+        """Get snapshots of connections per primary/replica/shard backend."""
+        return {
+            "primary": self.backend.stats(),
+            "replicas": [backend.stats() for backend in self.replica_backends],
+            "shards": [backend.stats() for backend in self.shard_backends],
+        }
+
+    def connection(
+        self, *, create: bool = True, shard_key: Any = None, **params
+    ) -> ConnectionContext:
+        """Get/create a connection from/to the current context.
+
+        :param shard_key: Create a connection to the shard of the given key
+        """
+        if shard_key is not None:
+            return self.shard(shard_key).connection(create=create, **params)
+
         return ConnectionContext(self.backend, use_existing=not create, **params)
 
+    def shard(self, key: Any) -> DatabaseShard:
+        """Get a shard by the given key. Queries of the shard run on the shard's backend."""
+        if not self.shards:
+            raise RuntimeError("No shards configured for this database")
+
+        return self.shards[self.shard_router(key)]
+
+    def all_shards(self) -> ShardsGroup:
+        """Run queries on all shards concurrently (scatter-gather, asyncio only)."""
+        if not self.shards:
+            raise RuntimeError("No shards configured for this database")
+
+        return ShardsGroup(self.shards)
+
     def replica(self, **params) -> ConnectionContext:
         """Get a read-only connection to a replica backend."""
         if not self.replica_backends:
@@ -119,9 +215,17 @@ class Database:
         backend = choice(self.replica_backends)  # noqa: S311
         return ConnectionContext(backend, use_existing=False, read_only=True, **params)
 
-    def transaction(self, *, create: bool = False, **params) -> TransactionContext:
-        """Create a transaction."""
-        return TransactionContext(self.backend, use_existing=not create, **params)
+    def transaction(
+        self, *, create: bool = False, retries: int = 0, backoff: float = 0.05, **params
+    ) -> TransactionContext:
+        """Create a transaction.
+
+        :param retries: Rerun the transaction on transient errors (as a decorator/runner)
+        :param backoff: A base delay between retries (exponential, with jitter)
+        """
+        return TransactionContext(
+            self.backend, use_existing=not create, retries=retries, backoff=backoff, **params
+        )
 
     async def execute(self, query: Any, *params, **options) -> Any:
         """Execute a query."""
@@ -129,10 +233,50 @@ class Database:
             return await conn.execute(query, *params, **options)
 
     async def executemany(self, query: Any, *params, **options) -> Any:
-        """Execute a query many times."""
+        """Execute a query many times.
+
+        A single iterator/generator or async iterable of params is executed by chunks
+        (see `bulk_execute`).
+        """
+        if len(params) == 1 and is_stream(params[0]):
+            return await self.bulk_execute(query, params[0], **options)
+
         async with self.connection(create=False) as conn:
             return await conn.executemany(query, *params, **options)
 
+    async def bulk_execute(
+        self,
+        query: Any,
+        params: Iterable[Sequence] | AsyncIterable[Sequence],
+        *,
+        chunk_size: int = 1000,
+        transaction: bool = True,
+        progress: Callable[[int], Any] | None = None,
+        **options,
+    ) -> int:
+        """Execute a query for params from a sync or async iterable by chunks.
+
+        Every chunk is executed with one driver call (in its own transaction), only one chunk
+        is kept in memory. Return the number of executed params.
+
+        :param chunk_size: Number of params per chunk
+        :param transaction: Execute every chunk in a transaction
+        :param progress: A function (or a coroutine function) to call with a number of
+            executed params after every chunk
+        """
+        total = 0
+        async for chunk in chunked(params, chunk_size):
+            async with self.transaction() if transaction else self.connection(create=False):
+                await self.executemany(query, *chunk, **options)
+
+            total += len(chunk)
+            if progress is not None:
+                res = progress(total)
+                if isawaitable(res):
+                    await res
+
+        return total
+
     async def fetchall(self, query: Any, *params, **options) -> list[TRecord]:
         """Fetch all rows."""
         async with self.connection(create=False) as conn:
@@ -153,12 +297,176 @@ class Database:
         async with self.connection(create=False) as conn:
             return await conn.fetchval(query, *params, column=column, **options)
 
+    async def export(self, query: Any, target: str | PathLike | IO[str], *params, **options) -> int:
+        """Stream results into a file (path or file object) as CSV or JSON Lines."""
+        async with self.connection(create=False) as conn:
+            return await conn.export(query, target, *params, **options)
+
+    async def paginate(
+        self,
+        query: Any,
+        *params,
+        key: str | tuple[str, ...] = "id",
+        page_size: int = 1000,
+        result: TResult | None = None,
+        as_: type | None = None,
+    ) -> AsyncIterator[list[TRecord]]:
+        """Iterate through pages of results using keyset (seek) pagination.
+
+        Pages are ordered by the key columns, every page is fetched with a separate query
+        (a connection is not held between pages if there is no current one). Rows are read
+        as records to get the keys and converted into the result format after.
+
+        :param query: A table name or a query (with params)
+        :param key: Unique column(s) to order by
+        """
+        backend = self.backend
+        result = as_ or result or backend.result
+        sql = backend.__convert_sql__(query).strip()
+        if " " not in sql:
+            sql = f"SELECT * FROM {sql}"  # noqa: S608
+
+        key = (key,) if isinstance(key, str) else key
+        columns = ", ".join(key)
+        order = f"ORDER BY {columns} LIMIT {page_size}"
+        marks = ", ".join(backend.placeholder(len(params) + num) for num in range(1, len(key) + 1))
+        seek = f"WHERE ({columns}) > ({marks})"
+
+        page_sql, args = f"SELECT * FROM ({sql}) AS _page {order}", params  # noqa: S608
+        while True:
+            rows = await self.fetchall(page_sql, *args, result="record")
+            if rows:
+                yield convert_records(rows, result)
+
+            if len(rows) < page_size:
+                break
+
+            last = rows[-1]
+            page_sql = f"SELECT * FROM ({sql}) AS _page {seek} {order}"  # noqa: S608
+            args = (*params, *(last[name] for name in key))
+
     async def iterate(self, query: Any, *params, **options) -> AsyncIterator[TRecord]:
         """Iterate through results."""
         async with self.connection(create=False) as conn:
             async for res in conn.iterate(query, *params, **options):
                 yield res
 
+    async def listen(self, channel: str, callback: Callable[[Notification], Any]):
+        """Subscribe the callback to notifications of the channel (LISTEN).
+
+        Notifications are received with a dedicated connection outside of the pool.
+        """
+        listener = self.listener
+        if listener is None:
+            listener_cls = self.backend.listener_cls
+            if listener_cls is None:
+                raise RuntimeError("LISTEN/NOTIFY is not supported by the backend")
+            listener = self.listener = listener_cls(self.backend)
+
+        await listener.listen(channel, callback)
+
+    async def unlisten(self, channel: str, callback: Callable[[Notification], Any]):
+        """Unsubscribe the callback from notifications of the channel."""
+        if self.listener is not None:
+            await self.listener.unlisten(channel, callback)
+
+    async def notifications(self, *channels: str) -> AsyncIterator[Notification]:
+        """Iterate through notifications of the given channels."""
+        queue: asyncio.Queue[Notification] = asyncio.Queue()
+        for channel in channels:
+            await self.listen(channel, queue.put_nowait)
+
+        try:
+            while True:
+                yield await queue.get()
+
+        finally:
+            for channel in channels:
+                await self.unlisten(channel, queue.put_nowait)
+
+    async def notify(self, channel: str, payload: str = "") -> Any:
+        """Send a notification to the channel."""
+        backend = self.backend
+        sql = f"SELECT pg_notify({backend.placeholder(1)}, {backend.placeholder(2)})"
+        return await self.execute(sql, channel, payload)
+
+
+class DatabaseShard(Database):
+    """A shard of a database. Supports the database's query and connection methods."""
+
+    def __init__(self, db: Database, backend: ABCDatabaseBackend):
+        self.db = db
+        self.url = backend.url.geturl()
+        self.logger = db.logger
+        self.backend = backend
+        self.replica_backends = []
+        self.shard_backends = []
+        self.shards = []
+
+    def __repr__(self):
+        return f"<DatabaseShard {self._url_repr()}>"
+
+    async def connect(self) -> Database:
+        """Connect the parent database."""
+        return await self.db.connect()
+
+    async def disconnect(self, *exit_args) -> None:
+        """Disconnect the parent database."""
+        await self.db.disconnect(*exit_args)
+
+    def connection(self, *, create: bool = True, **params) -> ConnectionContext:
+        # Do not use connections to other backends
+        conn = current_conn.get()
+        if conn is not None and conn.backend is not self.backend:
+            create = True
+        return ConnectionContext(self.backend, use_existing=not create, **params)
+
+    def transaction(
+        self, *, create: bool = False, retries: int = 0, backoff: float = 0.05, **params
+    ) -> TransactionContext:
+        conn = current_conn.get()
+        if conn is not None and conn.backend is not self.backend:
+            create = True
+        return super(DatabaseShard, self).transaction(
+            create=create, retries=retries, backoff=backoff, **params
+        )
+
+
+class ShardsGroup:
+    """Run queries on the given shards concurrently and merge results."""
+
+    __slots__ = ("shards",)
+
+    def __init__(self, shards: list[DatabaseShard]):
+        self.shards = shards
+
+    async def gather(self, method: str, *args, **kwargs) -> list[Any]:
+        """Call the given method on every shard concurrently, return results in shards order."""
+        return await asyncio.gather(
+            *(getattr(shard, method)(*args, **kwargs) for shard in self.shards)
+        )
+
+    async def execute(self, query: Any, *params, **options) -> list[Any]:
+        """Execute a query on every shard. Return results per shard."""
+        return await self.gather("execute", query, *params, **options)
+
+    async def executemany(self, query: Any, *params, **options) -> list[Any]:
+        """Execute a query many times on every shard. Return results per shard."""
+        return await self.gather("executemany", query, *params, **options)
+
+    async def fetchall(self, query: Any, *params, **options) -> list[TRecord]:
+        """Fetch and merge rows from all shards."""
+        results = await self.gather("fetchall", query, *params, **options)
+        return [row for rows in results for row in rows]
+
+    async def fetchone(self, query: Any, *params, **options) -> list[TRecord | None]:
+        """Fetch a row per shard."""
+        return await self.gather("fetchone", query, *params, **options)
+
+    async def fetchval(self, query: Any, *params, **options) -> list[Any]:
+        """Fetch a value per shard."""
+        return await self.gather("fetchval", query, *params, **options)
+
 
 class ConnectionContext:
     __slots__ = "conn", "create_conn", "token"
@@ -195,14 +503,72 @@ class ConnectionContext:
 
 
 class TransactionContext(ConnectionContext):
-    __slots__ = "conn", "release_conn", "token", "trans"
+    __slots__ = (
+        "backend",
+        "backoff",
+        "conn",
+        "params",
+        "release_conn",
+        "retries",
+        "token",
+        "trans",
+        "use_existing",
+    )
 
     if TYPE_CHECKING:
         trans: ABCTransaction
 
-    def __init__(self, backend: ABCDatabaseBackend, *, use_existing: bool = True, **params):
+    def __init__(
+        self,
+        backend: ABCDatabaseBackend,
+        *,
+        use_existing: bool = True,
+        retries: int = 0,
+        backoff: float = 0.05,
+        **params,
+    ):
         super(TransactionContext, self).__init__(backend, use_existing=use_existing)
         self.trans = self.conn.transaction(**params)
+        self.backend = backend
+        self.use_existing = use_existing
+        self.retries = retries
+        self.backoff = backoff
+        self.params = params
+
+    def __call__(self, func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Run the decorated function in the transaction."""
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.run(func, *args, **kwargs)
+
+        return wrapper
+
+    async def run(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Run the function in a transaction. Rerun it on transient errors."""
+        backend = self.backend
+        attempt = 0
+        while True:
+            ctx = TransactionContext(backend, use_existing=self.use_existing, **self.params)
+            conn = ctx.conn
+            # Nested transactions (savepoints) could not be retried alone
+            nested = not ctx.create_conn and bool(conn.transactions or conn.pending)
+            try:
+                async with ctx:
+                    return await func(*args, **kwargs)
+
+            except Exception as exc:
+                if nested or not backend.is_transient(exc):
+                    raise
+
+                if attempt >= self.retries:
+                    backend.metrics["transaction_retries_exhausted"] += 1
+                    raise
+
+                attempt += 1
+                backend.metrics["transaction_retries"] += 1
+                backend.logger.info("Retry transaction (%d/%d): %s", attempt, self.retries, exc)
+                await conn.sleep(uniform(0, self.backoff * 2**attempt))  # noqa: S311
 
     async def __aenter__(self):  # type: ignore[override]
         await super(TransactionContext, self).__aenter__()
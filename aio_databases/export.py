@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+import io
+from contextlib import contextmanager
+from json import dumps
+from os import PathLike
+from typing import IO, TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+TFormat = Literal["csv", "jsonl"]
+FORMATS = ("csv", "jsonl")
+BUFFER_SIZE = 1 << 16
+
+
+@contextmanager
+def open_target(target: str | PathLike | IO[str]) -> Iterator[IO[str]]:
+    """Open a file by the given path or use the given file object as is."""
+    if isinstance(target, (str, PathLike)):
+        with open(target, "w", newline="", encoding="utf-8") as fileobj:  # noqa: PTH123
+            yield fileobj
+    else:
+        yield target
+
+
+class Writer:
+    """Format rows into CSV/JSON Lines and write them by large blocks."""
+
+    __slots__ = "buffer", "csv", "fileobj", "format", "names"
+
+    def __init__(
+        self,
+        fileobj: IO[str],
+        names: Sequence[str],
+        *,
+        format: TFormat = "csv",  # noqa: A002
+        header: bool = True,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+
+        self.fileobj = fileobj
+        self.names = names
+        self.format = format
+        self.buffer = io.StringIO()
+        self.csv = csv.writer(self.buffer, lineterminator="\n")
+        if header and format == "csv":
+            self.csv.writerow(names)
+
+    def write(self, rows: Iterable[Sequence]):
+        buffer = self.buffer
+        if self.format == "csv":
+            self.csv.writerows(rows)
+        else:
+            names = self.names
+            for row in rows:
+                buffer.write(dumps(dict(zip(names, row, strict=True)), default=str))
+                buffer.write("\n")
+
+        if buffer.tell() >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        buffer = self.buffer
+        self.fileobj.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
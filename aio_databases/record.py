@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from collections.abc import ItemsView, Iterator, KeysView, Mapping, Sequence, ValuesView
-from typing import Any, cast
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .types import TResult
 
 
 class Record(Mapping):
@@ -56,3 +63,99 @@ class Record(Mapping):
 
     def __eq__(self, obj):
         return self._values == tuple(obj)
+
+
+def row_factory(
+    result: TResult | None, description: Sequence[Sequence] | None
+) -> Callable[[Any], Any] | None:
+    """Get a function to convert driver's rows (`None` to keep the rows as is).
+
+    Queries without a result (`description` is None) keep the rows as is.
+    """
+    if description is None:
+        return None
+
+    if isinstance(result, type):
+        return model_factory(result, tuple(d[0] for d in description))
+
+    if result is None or result == "record":
+        return lambda row: Record(row, description)
+
+    if result == "dict":
+        keys = [d[0] for d in description]
+        return lambda row: dict(zip(keys, row, strict=True))
+
+    if result == "tuple":
+        return tuple
+
+    if result == "native":
+        return None
+
+    raise ValueError(f"Unsupported result format: {result}")
+
+
+def convert_records(records: list, result: TResult | None) -> list:
+    """Convert records (mappings, e.g. `result="record"`) into the given result format."""
+    if not records or result is None or result == "record":
+        return records
+
+    # Records of asyncpg are native rows
+    if result == "native" and not isinstance(records[0], Record):
+        return records
+
+    # asyncpg records iterate over values, get the names with `keys`
+    names = list(records[0].keys())
+    factory = row_factory(result, [[name] for name in names])
+    if factory is None:
+        return [tuple(rec.values()) for rec in records]
+    return [factory(tuple(rec.values())) for rec in records]
+
+
+@lru_cache(maxsize=256)
+def model_factory(model: type, names: tuple[str, ...]) -> Callable[[Any], Any]:
+    """Build (and cache) a constructor of the model from rows with the given columns.
+
+    NamedTuples and dataclasses are bound by their fields: positionally while the fields go
+    in the order of the columns, by keywords after. Columns without fields are skipped.
+    Other classes get all the columns as keywords.
+    """
+    model_fields: tuple[str, ...] = getattr(model, "_fields", ())
+    if is_dataclass(model):
+        model_fields = tuple(f.name for f in fields(model) if f.init)
+
+    if not model_fields:
+        return lambda row: model(**dict(zip(names, row, strict=True)))
+
+    if model_fields == names and hasattr(model, "_make"):
+        return model._make  # type: ignore[attr-defined]
+
+    columns: dict[str, int] = {}
+    for idx, name in enumerate(names):
+        columns.setdefault(name, idx)
+
+    # Field names are identifiers, column names never get into the code
+    args: list[str] = []
+    positional = True
+    for num, name in enumerate(model_fields):
+        idx = columns.get(name)
+        if idx is None:
+            positional = False
+            continue
+
+        positional = positional and idx == num
+        args.append(f"row[{idx}]" if positional else f"{name}=row[{idx}]")
+
+    namespace: dict[str, Any] = {"model": model}
+    exec(f"def make(row):\n    return model({', '.join(args)})", namespace)  # noqa: S102
+    return namespace["make"]
+
+
+def row_size(row: Any) -> int:
+    """Estimate the size of the row's values in bytes (strings and bytes by length)."""
+    if hasattr(row, "values"):
+        values = row.values()
+    elif isinstance(row, (tuple, list)):
+        values = row
+    else:
+        values = getattr(row, "__dict__", {}).values()
+    return sum(len(value) if isinstance(value, (str, bytes, bytearray)) else 8 for value in values)
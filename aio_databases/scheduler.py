@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from time import perf_counter
+from typing import Any
+
+PRIORITIES = ("interactive", "default", "batch")
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when a connection cannot be admitted (the wait queue is full or timed out)."""
+
+
+class Scheduler:
+    """Admission control in front of a backend's acquire (asyncio only).
+
+    At most `limit` connections are in use at once, the rest wait in per-priority queues.
+    Waiters are admitted by priority (the order of `priorities`), FIFO inside a priority.
+
+    :param limit: Maximum number of connections in use
+    :param max_waiting: Maximum size of each wait queue (fail fast when full)
+    :param timeout: Maximum time to wait for admission
+    :param priorities: Priority classes from the highest to the lowest
+    :param reserved: Number of slots reserved for a priority class
+    :param default: A priority class for connections without a priority (`default` or the
+        middle one of `priorities`)
+    """
+
+    __slots__ = (
+        "default",
+        "limit",
+        "max_waiting",
+        "metrics",
+        "priorities",
+        "reserved",
+        "timeout",
+        "used",
+        "waiters",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        limit: int,
+        *,
+        max_waiting: int | None = None,
+        timeout: float | None = None,
+        priorities: tuple[str, ...] | None = None,
+        reserved: dict[str, int] | None = None,
+        default: str | None = None,
+    ):
+        priorities = priorities or PRIORITIES
+        reserved = reserved or {}
+        if default is None:
+            default = "default" if "default" in priorities else priorities[len(priorities) // 2]
+        if default not in priorities or not set(reserved) <= set(priorities):
+            raise ValueError(f"Unknown priority, supported: {', '.join(priorities)}")
+
+        if sum(reserved.values()) > limit:
+            raise ValueError("Reserved slots exceed the concurrency limit")
+
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.priorities = priorities
+        self.reserved = reserved
+        self.default = default
+        self.used = dict.fromkeys(priorities, 0)
+        self.waiters: dict[str, deque[asyncio.Future]] = {p: deque() for p in priorities}
+        self.metrics: dict[str, dict[str, Any]] = {
+            p: {"admitted": 0, "rejected": 0, "wait_time": 0.0, "max_wait": 0.0} for p in priorities
+        }
+
+    @property
+    def in_use(self) -> int:
+        return sum(self.used.values())
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self.waiters.values())
+
+    def can_admit(self, priority: str) -> bool:
+        """Check for a free slot which is not reserved by other priority classes."""
+        used = self.used
+        reserved = sum(
+            max(0, num - used[name]) for name, num in self.reserved.items() if name != priority
+        )
+        return self.limit - self.in_use > reserved
+
+    async def acquire(self, priority: str | None = None) -> None:
+        priority = priority or self.default
+        if priority not in self.used:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        metrics = self.metrics[priority]
+        rank = self.priorities.index(priority)
+        if self.can_admit(priority) and not any(
+            self.waiters[name] for name in self.priorities[: rank + 1]
+        ):
+            self.used[priority] += 1
+            metrics["admitted"] += 1
+            return
+
+        queue = self.waiters[priority]
+        if self.max_waiting is not None and len(queue) >= self.max_waiting:
+            metrics["rejected"] += 1
+            raise PoolExhaustedError(f"Too many connections are waiting ({priority})")
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        started = perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+
+        except BaseException as exc:
+            with suppress(ValueError):
+                queue.remove(waiter)
+
+            # The slot has been granted right before the cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release(priority)
+
+            if isinstance(exc, asyncio.TimeoutError):
+                metrics["rejected"] += 1
+                raise PoolExhaustedError(f"Connection admission timed out ({priority})") from exc
+            raise
+
+        waited = perf_counter() - started
+        metrics["admitted"] += 1
+        metrics["wait_time"] += waited
+        metrics["max_wait"] = max(metrics["max_wait"], waited)
+
+    def release(self, priority: str | None = None) -> None:
+        self.used[priority or self.default] -= 1
+        self.wakeup()
+
+    def wakeup(self):
+        """Admit waiters while there are free slots."""
+        for priority in self.priorities:
+            queue = self.waiters[priority]
+            while queue and self.can_admit(priority):
+                waiter = queue.popleft()
+                if not waiter.done():
+                    self.used[priority] += 1
+                    waiter.set_result(True)
+
+    def reset(self):
+        """Forget used slots and waiters (inherited by a forked process)."""
+        self.used = dict.fromkeys(self.priorities, 0)
+        self.waiters = {p: deque() for p in self.priorities}
+
+    def stats(self) -> dict[str, Any]:
+        """Get queue depths and wait times."""
+        return {
+            "limit": self.limit,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "priorities": {
+                name: dict(self.metrics[name], in_use=self.used[name], waiting=len(queue))
+                for name, queue in self.waiters.items()
+            },
+        }
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from bisect import bisect
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def hash_key(key: Any) -> int:
+    return int.from_bytes(blake2b(str(key).encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """A consistent hash ring. Route keys to nodes (return an index of the node).
+
+    Adding or removing a node moves only the keys of the node's neighbours.
+
+    :param nodes: Node names (shards' URLs)
+    :param replicas: Number of virtual nodes per a node
+    """
+
+    __slots__ = "hashes", "nodes", "ring"
+
+    def __init__(self, nodes: Sequence[str], *, replicas: int = 100):
+        if not nodes:
+            raise ValueError("The ring requires at least one node")
+
+        self.nodes = list(nodes)
+        ring = sorted(
+            (hash_key(f"{node}#{num}"), idx)
+            for idx, node in enumerate(self.nodes)
+            for num in range(replicas)
+        )
+        self.hashes = [point for point, _ in ring]
+        self.ring = [idx for _, idx in ring]
+
+    def __call__(self, key: Any) -> int:
+        pos = bisect(self.hashes, hash_key(key)) % len(self.hashes)
+        return self.ring[pos]
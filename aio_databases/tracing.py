@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from re import compile as re
+from typing import TYPE_CHECKING, Any
+
+from .url import redact_url
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from urllib.parse import SplitResult
+
+RE_SPACES = re(r"\s+")
+RE_LITERALS = re(r"'(?:[^']|'')*'|(?<![\w$:])\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace literals with placeholders and collapse whitespaces."""
+    return RE_LITERALS.sub("?", RE_SPACES.sub(" ", sql).strip())
+
+
+class Tracer:
+    """Emit spans with an OpenTelemetry-compatible tracer.
+
+    The tracer has to support `start_as_current_span(name, attributes=...)` and
+    `start_span(name, attributes=...)`, e.g. `opentelemetry.trace.get_tracer(__name__)`.
+
+    :param tracer: A tracer
+    :param db_system: A database system (`db_type` of a backend)
+    :param url: A database URL (redacted in attributes)
+    """
+
+    __slots__ = "attributes", "tracer"
+
+    def __init__(self, tracer: Any, db_system: str, url: SplitResult):
+        self.tracer = tracer
+        self.attributes: dict[str, Any] = {
+            "db.system": db_system,
+            "db.connection_string": redact_url(url).geturl(),
+        }
+        if url.hostname:
+            self.attributes["server.address"] = url.hostname
+        if url.port:
+            self.attributes["server.port"] = url.port
+
+    def get_attributes(self, sql: str | None) -> dict[str, Any]:
+        attrs = dict(self.attributes)
+        if sql:
+            attrs["db.statement"] = normalize_sql(sql)
+            attrs["db.operation"] = sql.split(None, 1)[0].upper()
+        return attrs
+
+    @contextmanager
+    def span(self, name: str, sql: str | None = None) -> Iterator[Any]:
+        """Start a span as the current one (in the current context)."""
+        attrs = self.get_attributes(sql)
+        with self.tracer.start_as_current_span(name, attributes=attrs) as span:
+            yield span
+
+    def start_span(self, name: str, sql: str | None = None) -> Any:
+        """Start a span which is not attached to the context (for generators)."""
+        return self.tracer.start_span(name, attributes=self.get_attributes(sql))
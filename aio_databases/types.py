@@ -1,5 +1,6 @@
-from typing import Any, Awaitable, Callable, Mapping, TypeVar
+from typing import Any, Awaitable, Callable, Literal, Mapping, TypeVar, Union
 
 TRecord = Mapping[str, Any]
+TResult = Union[Literal["tuple", "dict", "record", "native"], type]
 TInitConnection = Callable[[Any], Awaitable[Any]]
 TVConnection = TypeVar("TVConnection")
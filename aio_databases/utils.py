@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, Iterator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Get a percentile of the sorted values (nearest rank)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))]
+
+
+def is_stream(value: Any) -> bool:
+    """Check the value is an iterator/generator or an async iterable (not a sequence)."""
+    return isinstance(value, (Iterator, AsyncIterable))
+
+
+async def chunked(items: Iterable | AsyncIterable, size: int) -> AsyncIterator[list]:
+    """Split a sync or async iterable into lists of the given size."""
+    if size < 1:
+        raise ValueError("Chunk size should be positive")
+
+    chunk: list = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
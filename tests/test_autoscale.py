@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from aio_databases import Database
+
+
+@pytest.fixture
+def aiolib():
+    """Autoscaling is only supported for asyncio."""
+    return ("asyncio", {"loop_factory": None})
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+async def test_decisions():
+    with pytest.raises(ValueError, match="min_size"):
+        Database("simulated://", autoscale={"min_size": 5, "max_size": 2})
+
+    # The maximum concurrency limits the size
+    db = Database("simulated://", max_concurrency=3, autoscale={"max_size": 5})
+    autoscaler = db.backend.autoscaler
+    assert autoscaler
+    assert autoscaler.max_size == 3
+    assert db.backend.scheduler
+    assert db.backend.scheduler.limit == 1
+
+    db = Database("simulated://", autoscale={"min_size": 2, "max_size": 5, "shrink_after": 2})
+    backend, autoscaler = db.backend, db.backend.autoscaler
+    assert autoscaler
+    assert backend.scheduler
+    assert backend.scheduler.limit == 2
+
+    assert await autoscaler.check() is None
+
+    backend.waiting = 1
+    decision = await autoscaler.check()
+    assert decision
+    assert (decision.old, decision.new, decision.reason) == (2, 4, "1 waiting")
+    assert backend.scheduler.limit == 4
+
+    # Bounded by max_size
+    await autoscaler.check()
+    assert backend.scheduler.limit == 5
+    assert await autoscaler.check() is None
+
+    # Shrink gradually
+    backend.waiting = 0
+    assert await autoscaler.check() is None
+    decision = await autoscaler.check()
+    assert decision
+    assert (decision.old, decision.new) == (5, 4)
+
+    backend.in_use = 3
+    for _ in range(4):
+        await autoscaler.check()
+    assert backend.scheduler.limit == 4
+
+    backend.in_use = 4
+    decision = await autoscaler.check()
+    assert decision
+    assert decision.reason == "utilization 100%"
+
+    stats = backend.stats()["autoscale"]
+    assert stats["size"] == 5
+    assert (stats["grows"], stats["shrinks"]) == (3, 1)
+    assert [item["new"] for item in stats["decisions"]] == [4, 5, 4, 5]
+
+
+async def test_autoscale():
+    db = Database(
+        "simulated://?latency=0.01",
+        autoscale={"min_size": 1, "max_size": 4, "interval": 0.02, "shrink_after": 1},
+    )
+    async with db:
+        autoscaler = db.backend.autoscaler
+        assert autoscaler
+        assert autoscaler.task
+
+        async def worker():
+            for _ in range(10):
+                await db.fetchall("select 1")
+
+        await asyncio.gather(*(worker() for _ in range(8)))
+        assert db.backend.metrics["pool_grows"]
+        assert max(decision.new for decision in autoscaler.decisions) == 4
+
+        # Idle pools shrink
+        await asyncio.sleep(0.2)
+        assert autoscaler.size < 4
+
+    assert autoscaler.task is None
@@ -1,8 +1,13 @@
+from dataclasses import dataclass
+from typing import NamedTuple
+
 import pytest
+from psycopg2.extensions import ISQLQuote, adapters, cursor
 
-from aio_databases import Database
+from aio_databases import Codecs, Database
 from aio_databases.backends import BACKENDS
-from aio_databases.record import Record
+from aio_databases.backends.common import expand_values, is_cursor_query, multirow_batches
+from aio_databases.record import Record, model_factory, row_factory
 
 
 def test_backends(arm: bool):
@@ -31,6 +36,7 @@ def test_database(arm: bool):
     assert Database("asyncpg://db.sqlite")
 
     assert Database("trio-mysql://localhost")
+    assert Database("trio-mysql+pool://localhost", maxsize=2)
 
     if not arm:
         assert Database("aioodbc://localhost", dsn="Driver=SQLite;Database=db.sqlite")
@@ -62,6 +68,63 @@ def test_record():
     assert str(rec) == "id=1 name='test' id=2 name='test2'"
 
 
+def test_row_factory():
+    desc = [["id"], ["name"]]
+    row = (1, "test")
+
+    factory = row_factory(None, desc)
+    assert factory
+    assert isinstance(factory(row), Record)
+
+    factory = row_factory("dict", desc)
+    assert factory
+    assert factory(row) == {"id": 1, "name": "test"}
+
+    assert row_factory("tuple", desc) is tuple
+    assert row_factory("native", desc) is None
+
+    # Queries without a result
+    assert row_factory("dict", None) is None
+    assert row_factory(dict, None) is None
+
+    with pytest.raises(ValueError, match="Unsupported"):
+        row_factory("unknown", desc)  # type: ignore[arg-type]
+
+
+def test_model_factory():
+    class Point(NamedTuple):
+        x: int
+        y: int
+
+    @dataclass(slots=True)
+    class User:
+        id: int
+        name: str
+        email: str = ""
+
+    make = model_factory(Point, ("x", "y"))
+    assert make == Point._make
+    assert make((1, 2)) == Point(1, 2)
+    assert model_factory(Point, ("y", "x"))((1, 2)) == Point(2, 1)
+
+    make = model_factory(User, ("id", "name", "extra"))
+    assert make is model_factory(User, ("id", "name", "extra"))
+    assert make((1, "Tom", None)) == User(1, "Tom")
+    assert model_factory(User, ("email", "id", "name"))(("t@t.com", 1, "Tom")) == User(
+        1, "Tom", "t@t.com"
+    )
+
+    factory = row_factory(User, [["id"], ["name"]])
+    assert factory
+    assert factory((1, "Tom")) == User(1, "Tom")
+
+    class Plain:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+    assert model_factory(Plain, ("a", "b"))((1, 2)).kwargs == {"a": 1, "b": 2}
+
+
 def test_params():
     db = Database("asyncpg://localhost", convert_params=True)
     assert db.backend.__convert_sql__('select "%s", %s') == 'select "$1", $2'
@@ -70,3 +133,51 @@ def test_params():
     db = Database("aiosqlite://localhost", convert_params=True)
     assert db.backend.__convert_sql__('select "%s", %s') == 'select "?", ?'
     assert db.backend.__convert_sql__('select "%%s"') == 'select "%%s"'
+
+
+def test_aiopg_codecs():
+    class Point(NamedTuple):
+        x: int
+        y: int
+
+    codecs = Codecs().register("point", encoder=str, python_type=Point)
+    db = Database("aiopg://localhost", codecs=codecs)
+
+    # Encoders belong to the database's connections
+    assert (Point, ISQLQuote) not in adapters
+    assert issubclass(db.backend.options["cursor_factory"], cursor)
+
+
+def test_is_cursor_query():
+    assert is_cursor_query("select 1")
+    assert is_cursor_query("with nums as (select 1) select * from nums")
+    assert is_cursor_query("(select 1) union (select 2)")
+    assert is_cursor_query("-- a comment\n /* a block\n comment */ select 1")
+    assert is_cursor_query("with t as (select 1) select * from t for update")
+    assert not is_cursor_query("insert into t values (1) returning id")
+    assert not is_cursor_query("with t as (delete from t returning id) select * from t")
+
+    # Pooler mode is accepted by both PostgreSQL backends
+    db = Database("aiopg://localhost", pooler_mode=True)
+    assert db.backend.pooler_mode
+    assert "pooler_mode" not in db.backend.options
+
+
+def test_expand_values():
+    query = "insert into t (a, b) values ($1, lower($2)) returning id"
+    assert expand_values(query, 2, 2) == (
+        "insert into t (a, b) values ($1, lower($2)), ($3, lower($4)) returning id"
+    )
+    assert expand_values("INSERT INTO t VALUES (%s) RETURNING *", 2, 1) == (
+        "INSERT INTO t VALUES (%s), (%s) RETURNING *"
+    )
+    with pytest.raises(ValueError, match="INSERT"):
+        expand_values("update t set a = $1 returning id", 2, 1)
+    with pytest.raises(ValueError, match="inside VALUES"):
+        expand_values("insert into t values ($1) on conflict (a) do update set b = $2", 2, 2)
+    with pytest.raises(ValueError, match="inside VALUES"):
+        expand_values("with s as (select $2) insert into t values ($1)", 2, 2)
+
+    batches = list(multirow_batches("insert into t values (%s, %s)", [(1, 2)] * 20000))
+    assert len(batches) == 2
+    assert len(batches[0][1]) == 32766
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from aio_databases.bench import Workload, main, run
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+def test_workload():
+    workload = Workload.from_dict({"reads": ["select 1"], "writes": [["insert ...", 1]]})
+    assert workload.reads == [("select 1",)]
+    assert workload.writes == [("insert ...", 1)]
+
+    with pytest.raises(ValueError, match="no queries"):
+        Workload.from_dict({})
+
+
+async def test_run():
+    workload = Workload.from_dict(
+        {
+            "setup": ["create table bench (id integer primary key, value text)"],
+            "reads": ["select * from bench limit 10"],
+            "writes": [["insert into bench (value) values (?)", "test"]],
+            "write_ratio": 0.5,
+        }
+    )
+    url = "sqlite:///file:bench?mode=memory&cache=shared"
+    steps = await run(url, workload, concurrency=(1, 2), duration=0.05)
+    assert [step.concurrency for step in steps] == [1, 2]
+    for step in steps:
+        assert step.queries > 0
+        assert step.errors == 0
+        report = step.report()
+        assert report["qps"] > 0
+        assert report["p50_ms"] <= report["p99_ms"]
+        assert report["error"] == ""
+
+    # The first error is reported
+    workload = Workload.from_dict({"reads": ["select * from unknown"]})
+    (step,) = await run(url, workload, concurrency=(2,), duration=0.01)
+    assert step.errors > 0
+    assert "no such table" in step.report()["error"]
+
+
+def test_main(capsys):
+    assert main(["dummy://", "--concurrency", "1,2", "--duration", "0.01", "--json"]) == 0
+    reports = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [report["concurrency"] for report in reports] == [1, 2]
@@ -107,3 +107,23 @@ async def test_pool(pool: Database, aiolib: str):
     assert done
     assert len(done) == 5
     assert done == [1, 1, 1, 1, 1]
+
+
+async def test_stats(db: Database):
+    await db.fetchval("select 42")
+    async with db.connection():
+        stats = db.stats()
+        primary = stats["primary"]
+        assert primary["backend"] == db.backend.name
+        assert primary["in_use"] == 1
+        assert primary["open"] >= 1
+        assert primary["waiters"] == 0
+        assert primary["acquires"] == 2
+        assert primary["acquire_wait"]["p50"] <= primary["acquire_wait"]["max"]
+        assert stats["replicas"] == stats["shards"] == []
+
+    primary = db.stats()["primary"]
+    assert primary["in_use"] == 0
+    if primary["created"] is not None:
+        assert primary["created"] >= 1
+        assert primary["created"] - primary["closed"] == primary["open"]
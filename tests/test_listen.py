@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from aio_databases import Database, Notification
+from aio_databases.backends import ABCListener
+
+
+@pytest.fixture
+def aiolib():
+    """There is only backend for asyncio."""
+    return ("asyncio", {"loop_factory": None})
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+class FakeConnection:
+    def __init__(self):
+        self.channels = set()
+        self.lost = asyncio.Event()
+
+
+class Listener(ABCListener):
+    """Emulate a server's connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, reconnect_delay=0, **kwargs)
+        self.connections = []
+
+    async def _connect(self):
+        await asyncio.sleep(0)
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+    async def _close(self, conn):
+        conn.lost.set()
+
+    async def _listen(self, conn, channel):
+        conn.channels.add(channel)
+
+    async def _unlisten(self, conn, channel):
+        conn.channels.discard(channel)
+
+    async def _wait(self, conn):
+        await conn.lost.wait()
+
+
+async def test_listen_unsupported():
+    async with Database("sqlite:///:memory:") as db:
+        with pytest.raises(RuntimeError, match="not supported"):
+            await db.listen("test", print)
+
+
+async def test_listen():
+    db = Database("sqlite:///:memory:")
+    db.backend.listener_cls = Listener
+    received = []
+
+    async def callback(notification):
+        received.append(notification)
+
+    async with db:
+        await db.listen("cache", callback)
+        listener = db.listener
+        assert isinstance(listener, Listener)
+
+        conn = listener.connections[-1]
+        assert conn.channels == {"cache"}
+
+        listener.dispatch(Notification("cache", "users", 1))
+        listener.dispatch(Notification("other", "users", 1))
+        await asyncio.sleep(0)
+        assert received == [Notification("cache", "users", 1)]
+
+        # Reconnect and resubscribe
+        conn.lost.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(listener.connections) == 2
+        assert listener.connections[-1].channels == {"cache"}
+
+        await db.unlisten("cache", callback)
+        assert listener.connections[-1].channels == set()
+
+        async def produce():
+            await asyncio.sleep(0)
+            listener.dispatch(Notification("events", "1", 1))
+
+        task = asyncio.create_task(produce())
+        async for notification in db.notifications("events"):
+            assert notification.payload == "1"
+            break
+        await task
+
+    assert db.listener is None
+
+
+async def test_listen_concurrent():
+    db = Database("sqlite:///:memory:")
+    db.backend.listener_cls = Listener
+
+    async with db:
+        await asyncio.gather(db.listen("first", print), db.listen("second", print))
+        listener = db.listener
+        assert isinstance(listener, Listener)
+        assert len(listener.connections) == 1
+        assert listener.connections[0].channels == {"first", "second"}
+
+    assert listener.connections[0].lost.is_set()
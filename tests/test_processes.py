@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from aio_databases import Database
+
+
+@pytest.fixture
+def aiolib():
+    return ("asyncio", {"loop_factory": None})
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+async def test_fork(monkeypatch):
+    db = Database("simulated://?pool_size=2", max_concurrency=2)
+    async with db:
+        backend = db.backend
+        pool = backend.pool
+        async with db.connection():
+            assert backend.in_use == 1
+
+        # Emulate a forked process
+        monkeypatch.setattr("aio_databases.backends.getpid", lambda: 42)
+        backend.in_use = 1
+        assert backend.scheduler
+        backend.scheduler.used["default"] = 2
+
+        assert await db.fetchval("select 1") == 0
+        assert backend.pid == 42
+        assert backend.pool is not pool
+        assert backend.metrics["forks"] == 1
+        assert backend.stats()["in_use"] == 0
+        assert backend.scheduler.in_use == 0
+
+
+async def test_fork_concurrent(monkeypatch):
+    db = Database("simulated://?pool_size=2", max_concurrency=2)
+    async with db:
+        backend = db.backend
+        inherited = db.connection()
+        await inherited.acquire()
+
+        # Emulate a forked process
+        monkeypatch.setattr("aio_databases.backends.getpid", lambda: 42)
+        results = await asyncio.gather(*(db.fetchval("select 1") for _ in range(3)))
+        assert results == [0, 0, 0]
+        assert backend.metrics["forks"] == 1
+
+        # Connections of the parent process are abandoned
+        await inherited.release()
+        assert backend.in_use == 0
+        assert backend.scheduler
+        assert backend.scheduler.in_use == 0
+
+
+async def test_shared_memory_fork(monkeypatch):
+    db = Database("sqlite:///file:forked?mode=memory&cache=shared")
+    async with db:
+        keeper = db.backend.keeper
+        monkeypatch.setattr("aio_databases.backends.getpid", lambda: 42)
+        await db.execute("create table items (id integer)")
+        assert db.backend.keeper is not keeper
+        assert await db.fetchall("select * from items") == []
+
+
+def test_connection_budget(monkeypatch):
+    db = Database("asyncpg+pool://localhost/db", connection_budget=10, workers=4, min_size=5)
+    assert db.backend.max_connections == 2
+    assert db.backend.pool_options == {"min_size": 2, "max_size": 2}
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "8")
+    db = Database("trio-mysql+pool://localhost/db?maxsize=3", connection_budget=100)
+    assert db.backend.pool_options == {"minsize": 1, "maxsize": 3}
+
+    # Backends without a pool are limited with admission control
+    db = Database("sqlite:///:memory:", connection_budget=16)
+    assert db.backend.scheduler
+    assert db.backend.scheduler.limit == 2
+
+    # Admission control is built on asyncio
+    db = Database("trio-mysql://localhost/db", connection_budget=16)
+    assert db.backend.max_connections == 2
+    assert db.backend.scheduler is None
+
+    with pytest.raises(ValueError, match="asyncio"):
+        Database("trio-mysql://localhost/db", max_concurrency=2)
+
+    db = Database("simulated://", connection_budget=16, autoscale={"max_size": 10})
+    assert db.backend.autoscaler
+    assert db.backend.autoscaler.max_size == 2
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import pytest
 from pypika import Parameter
 
+from aio_databases import ResultTooLargeError
+
 if TYPE_CHECKING:
     from pypika_orm import Manager, Model
 
@@ -36,6 +38,41 @@ async def test_base(db: Database):
     assert res == 4
 
 
+async def test_result(db: Database):
+    res: Any = await db.fetchall("select (2 * %s) res", 2, result="tuple")
+    assert res == [(4,)]
+    assert isinstance(res[0], tuple)
+
+    res = await db.fetchall("select (2 * %s) res", 2, result="dict")
+    assert res == [{"res": 4}]
+
+    res = await db.fetchmany(10, "select (2 * %s) res", 2, result="dict")
+    assert res == [{"res": 4}]
+
+    res = await db.fetchone("select (2 * %s) res", 2, result="dict")
+    assert res == {"res": 4}
+
+    res = await db.fetchone("select (2 * %s) res", 2, result="native")
+    assert tuple(res) == (4,)
+
+    res = [rec async for rec in db.iterate("select (2 * %s) res", 2, result="dict")]
+    assert res == [{"res": 4}]
+
+
+async def test_as(db: Database):
+    class Result(NamedTuple):
+        res: int
+
+    res: Any = await db.fetchall("select (2 * %s) res", 2, as_=Result)
+    assert res == [Result(4)]
+
+    res = await db.fetchone("select (2 * %s) res", 2, as_=Result)
+    assert res == Result(4)
+
+    res = [rec async for rec in db.iterate("select (2 * %s) res", 2, as_=Result)]
+    assert res == [Result(4)]
+
+
 async def test_all(db: Database, user_cls: Model, manager: Manager, schema):
     user_manager = manager(user_cls)
     await db.execute(user_manager.delete())
@@ -94,6 +131,122 @@ async def test_execute_many(db: Database, user_cls: Model, manager: Manager, sch
     assert u2["name"] == "Tom"
 
 
+async def test_execute_many_returning(db: Database, user_cls: Model, manager: Manager, schema):
+    user_manager = manager(user_cls)
+    await db.execute(user_manager.delete())
+    qs = str(user_manager.insert(name=Parameter("%s"), fullname=Parameter("%s")))
+
+    if db.backend.db_type != "mysql":
+        rows = await db.executemany(
+            f"{qs} RETURNING id, name", ("Jim", "Jim Jones"), ("Tom", "Tom Smith"), returning=True
+        )
+        assert [row["name"] for row in rows] == ["Jim", "Tom"]
+        assert rows[1]["id"] > rows[0]["id"]
+
+    if db.backend.db_type != "postgresql":
+        keys = await db.executemany(qs, ("Ann", "Ann Lee"), ("Bob", "Bob Lee"), returning=True)
+        assert len(keys) == 2
+        assert keys[1] == keys[0] + 1
+        res = await db.fetchval(user_manager.select(user_cls.name).where(user_cls.id == keys[1]))
+        assert res == "Bob"
+
+
+async def test_bulk_execute(db: Database, user_cls: Model, manager: Manager, schema):
+    user_manager = manager(user_cls)
+    await db.execute(user_manager.delete())
+    qs = user_manager.insert(name=Parameter("%s"), fullname=Parameter("%s"))
+
+    async def users():
+        for num in range(5):
+            yield f"user{num}", f"User {num}"
+
+    progress = []
+    res = await db.bulk_execute(qs, users(), chunk_size=2, progress=progress.append)
+    assert res == 5
+    assert progress == [2, 4, 5]
+
+    # executemany streams iterators
+    res = await db.executemany(qs, ((f"name{num}", "") for num in range(3)), chunk_size=2)
+    assert res == 3
+    assert len(await db.fetchall(user_manager.select())) == 8
+
+
+async def test_result_limits(db: Database, user_cls: Model, manager: Manager, schema):
+    user_manager = manager(user_cls)
+    await db.execute(user_manager.delete())
+    qs = user_manager.insert(name=Parameter("%s"), fullname=Parameter("%s"))
+    await db.executemany(qs, ("Jim", "Jim Jones"), ("Tom", "Tom Smith"), ("Ann", "Ann Lee"))
+    query = user_manager.select(user_cls.name, user_cls.fullname)
+
+    assert len(await db.fetchall(query, max_rows=3)) == 3
+    with pytest.raises(ResultTooLargeError, match="more than 2 rows"):
+        await db.fetchall(query, max_rows=2)
+
+    rows = await db.fetchall(query, max_bytes=100, result="tuple")
+    assert sorted(rows) == [("Ann", "Ann Lee"), ("Jim", "Jim Jones"), ("Tom", "Tom Smith")]
+    with pytest.raises(ResultTooLargeError, match="more than 20 bytes"):
+        await db.fetchall(query, max_bytes=20)
+
+    # Database-wide defaults
+    backend = db.backend
+    backend.max_rows, backend.track_results = 1, True
+    try:
+        with pytest.raises(ResultTooLargeError):
+            await db.fetchall(query)
+        assert len(await db.fetchall(query, max_rows=10)) == 3
+        assert len(await db.fetchmany(2, query)) == 2
+    finally:
+        backend.max_rows, backend.track_results = None, False
+
+    stats = backend.statements.pop(str(query))
+    assert stats == {"calls": 2, "rows": 5, "bytes": 58}
+
+
+async def test_export(db: Database, tmp_path):
+    target = tmp_path / "export.csv"
+    res = await db.export("select (2 * %s) res, 'a' name", target, 2)
+    assert res == 1
+    assert target.read_text().splitlines() == ["res,name", "4,a"]
+
+    target = tmp_path / "export.jsonl"
+    res = await db.export("select (2 * %s) res, 'a' name", target, 2, format="jsonl")
+    assert res == 1
+    assert target.read_text() == '{"res": 4, "name": "a"}\n'
+
+    # PostgreSQL backends fail on the server side (COPY, DECLARE)
+    if db.backend.db_type != "postgresql":
+        with pytest.raises(ValueError, match="does not return rows"):
+            await db.export("create table if not exists export_test (id int)", target)
+        await db.execute("drop table if exists export_test")
+
+
+async def test_paginate(db: Database):
+    await db.execute("create table if not exists paginate_test (id int, name varchar(10))")
+    await db.execute("delete from paginate_test")
+    for num in range(5):
+        await db.execute("insert into paginate_test values (%s, %s)", num, f"n{num}")
+
+    pages = [page async for page in db.paginate("paginate_test", page_size=2)]
+    assert [[row["id"] for row in page] for page in pages] == [[0, 1], [2, 3], [4]]
+
+    query = "select id, name from paginate_test where id > %s"
+    pages = [page async for page in db.paginate(query, 0, key=("name", "id"), page_size=2)]
+    assert [[row["id"] for row in page] for page in pages] == [[1, 2], [3, 4]]
+
+    # Rows are converted into the result format after reading the keys
+    pages = [page async for page in db.paginate("paginate_test", page_size=3, result="tuple")]
+    assert pages == [[(0, "n0"), (1, "n1"), (2, "n2")], [(3, "n3"), (4, "n4")]]
+
+    class Item(NamedTuple):
+        id: int
+        name: str
+
+    pages = [page async for page in db.paginate("paginate_test", page_size=4, as_=Item)]
+    assert pages[1] == [Item(4, "n4")]
+
+    await db.execute("drop table paginate_test")
+
+
 async def test_iterate(db: Database, user_cls: Model, manager: Manager, schema):
     user_manager = manager(user_cls)
     qs = user_manager.insert(name=Parameter("%s"), fullname=Parameter("%s"))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from urllib.parse import urlsplit
+
+import pytest
+
+from aio_databases import Database, PoolExhaustedError
+from aio_databases.backends import BACKENDS
+from aio_databases.backends._aiosqlite import Backend as SQLiteBackend
+from aio_databases.scheduler import Scheduler
+
+
+@pytest.fixture
+def aiolib():
+    """There is only backend for asyncio."""
+    return ("asyncio", {"loop_factory": None})
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+async def test_scheduler_priorities():
+    scheduler = Scheduler(1)
+    await scheduler.acquire()
+
+    done = []
+
+    async def process(priority):
+        await scheduler.acquire(priority)
+        done.append(priority)
+        scheduler.release(priority)
+
+    tasks = [asyncio.create_task(process(p)) for p in ("batch", "default", "interactive")]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 3
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    assert done == ["interactive", "default", "batch"]
+
+    stats = scheduler.stats()
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["priorities"]["batch"]["admitted"] == 1
+    assert stats["priorities"]["batch"]["wait_time"] > 0
+
+
+async def test_scheduler_fail_fast():
+    scheduler = Scheduler(1, max_waiting=0)
+    await scheduler.acquire()
+    with pytest.raises(PoolExhaustedError, match="waiting"):
+        await scheduler.acquire()
+
+    scheduler = Scheduler(1, timeout=1e-3)
+    await scheduler.acquire()
+    with pytest.raises(PoolExhaustedError, match="timed out"):
+        await scheduler.acquire("batch")
+
+    assert scheduler.waiting == 0
+    assert scheduler.stats()["priorities"]["batch"]["rejected"] == 1
+
+    with pytest.raises(ValueError, match="Unknown priority"):
+        await scheduler.acquire("unknown")
+
+
+async def test_scheduler_reserved():
+    scheduler = Scheduler(2, reserved={"interactive": 1}, max_waiting=0)
+    await scheduler.acquire("batch")
+    with pytest.raises(PoolExhaustedError):
+        await scheduler.acquire("batch")
+
+    await scheduler.acquire("interactive")
+    assert scheduler.in_use == 2
+
+
+async def test_database_admission():
+    db = Database("sqlite:///:memory:", max_concurrency=1, max_waiting=0)
+    assert db.backend.scheduler
+
+    async with db, db.connection():
+        with pytest.raises(PoolExhaustedError):
+            async with db.connection(priority="interactive"):
+                pass
+
+    assert db.backend.scheduler.in_use == 0
+
+    async with db.connection(priority="interactive") as conn:
+        assert conn.priority == "interactive"
+        assert await db.fetchval("select 1") == 1
+
+
+async def test_database_priorities():
+    db = Database("sqlite:///:memory:", max_concurrency=2, priorities=("high", "low"))
+    assert db.backend.scheduler
+    assert db.backend.scheduler.default == "low"
+
+    db = Database(
+        "sqlite:///:memory:",
+        max_concurrency=2,
+        priorities=("high", "low"),
+        default_priority="high",
+    )
+    assert db.backend.scheduler
+    assert db.backend.scheduler.default == "high"
+
+    async with db, db.connection():
+        assert db.backend.scheduler.used["high"] == 1
+
+
+async def test_legacy_release():
+    released = []
+
+    with pytest.warns(DeprecationWarning, match="_release"):
+
+        class Backend(SQLiteBackend):
+            name = "legacy"
+
+            async def release(self, conn):
+                released.append(conn)
+                await conn.close()
+
+    BACKENDS.remove(Backend)
+    backend = Backend(urlsplit("sqlite:///:memory:"), max_concurrency=1)
+    conn = await backend.acquire()
+    await backend.release(conn)
+    assert released == [conn]
+    assert backend.in_use == 0
@@ -0,0 +1,61 @@
+import pytest
+
+from aio_databases import Database
+from aio_databases.shards import HashRing
+
+SHARDS = [
+    "sqlite:///file:shard1?mode=memory&cache=shared",
+    "sqlite:///file:shard2?mode=memory&cache=shared",
+]
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+def test_hash_ring():
+    ring = HashRing(["a", "b", "c"])
+    keys = range(1000)
+    routes = [ring(key) for key in keys]
+    assert set(routes) == {0, 1, 2}
+    assert routes == [ring(key) for key in keys]
+
+    # Only keys of the new node are moved
+    ring = HashRing(["a", "b", "c", "d"])
+    moved = [(old, ring(key)) for key, old in zip(keys, routes, strict=True) if ring(key) != old]
+    assert moved
+    assert all(new == 3 for _, new in moved)
+
+    with pytest.raises(ValueError, match="at least one"):
+        HashRing([])
+
+
+async def test_shards():
+    db = Database("sqlite:///:memory:")
+    with pytest.raises(RuntimeError, match="No shards configured"):
+        db.shard(1)
+
+    db = Database("sqlite:///:memory:", shards=SHARDS, shard_router=lambda key: key % 2)
+    async with db:
+        await db.all_shards().execute("create table users (id integer, name text)")
+
+        for num in range(4):
+            await db.shard(num).execute("insert into users values (?, ?)", num, f"user{num}")
+
+        assert await db.shard(0).fetchall("select id from users") == [(0,), (2,)]
+        assert await db.shard(1).fetchval("select count(*) from users") == 2
+
+        async with db.connection(shard_key=3) as conn:
+            assert conn.backend is db.shard_backends[1]
+            assert await db.fetchall("select id from users") == [(1,), (3,)]
+
+            # Shards do not reuse connections to other backends
+            assert await db.shard(2).fetchall("select id from users") == [(0,), (2,)]
+
+            async with db.shard(2).transaction():
+                await db.shard(2).execute("insert into users values (?, ?)", 4, "user4")
+
+        rows = await db.all_shards().fetchall("select id from users order by id")
+        assert sorted(row["id"] for row in rows) == [0, 1, 2, 3, 4]
+        assert await db.all_shards().fetchval("select count(*) from users") == [3, 2]
@@ -0,0 +1,68 @@
+import asyncio
+from time import perf_counter
+
+import pytest
+
+from aio_databases import Database
+from aio_databases.backends._simulated import SimulatedError
+
+
+@pytest.fixture
+def aiolib():
+    """There is only backend for asyncio."""
+    return ("asyncio", {"loop_factory": None})
+
+
+@pytest.fixture
+def backend():
+    return "aiosqlite"
+
+
+async def test_results():
+    db = Database(
+        "simulated://?rows=3&columns=2",
+        results={"select name from users": (["name"], [("Tom",), ("Jim",)])},
+    )
+    async with db:
+        rows = await db.fetchall("select * from anything")
+        assert [tuple(row) for row in rows] == [(0, 1), (1, 2), (2, 3)]
+        assert rows[0]["col1"] == 1
+        assert await db.fetchval("select 1") == 0
+        assert await db.fetchmany(1, "select name from users", result="dict") == [{"name": "Tom"}]
+        assert [rec["name"] async for rec in db.iterate("select name from users")] == [
+            "Tom",
+            "Jim",
+        ]
+        assert await db.execute("insert ...") == (1, 1)
+
+
+async def test_latency_and_pool():
+    db = Database("simulated://", latency=0.01, distribution="exponential", pool_size=2)
+    assert db.backend.get_latency() > 0
+
+    db = Database("simulated://?latency=0.02&pool_size=2")
+    async with db:
+        started = perf_counter()
+        await asyncio.gather(*(db.fetchall("select 1") for _ in range(4)))
+        # Only two connections are available
+        assert perf_counter() - started >= 0.04
+
+        stats = db.stats()["primary"]
+        assert stats["max_size"] == 2
+        assert stats["idle"] == 2
+
+    with pytest.raises(ValueError, match="distribution"):
+        Database("simulated://", distribution="unknown")
+
+
+async def test_errors():
+    db = Database("simulated://?error_rate=1")
+    async with db:
+        with pytest.raises(SimulatedError):
+            await db.fetchall("select 1")
+
+    db = Database("simulated://?error_rate=1&transient=true")
+    async with db:
+        with pytest.raises(SimulatedError):
+            await db.transaction(retries=2, backoff=0).run(db.fetchall, "select 1")
+        assert db.backend.metrics["transaction_retries"] == 2
@@ -1,9 +1,11 @@
+import sqlite3
 from datetime import datetime, timezone
+from typing import NamedTuple
 
 import pytest
 from pypika_orm import Manager, Model
 
-from aio_databases import Database
+from aio_databases import Codecs, Database
 
 
 @pytest.fixture
@@ -84,3 +86,135 @@ async def test_persistent_db(tmp_path, user_cls: Model, manager: Manager):
 
         async with db.connection():
             assert await db.fetchall(user_manager.select())
+
+
+async def test_transaction_retries():
+    db = Database("sqlite:///:memory:")
+    calls = []
+
+    @db.transaction(retries=2, backoff=0)
+    async def process():
+        calls.append(1)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return await db.fetchval("select 42")
+
+    async def fail(exc):
+        calls.append(1)
+        raise exc
+
+    async with db:
+        assert await process() == 42
+        assert len(calls) == 3
+        assert db.backend.metrics["transaction_retries"] == 2
+
+        calls.clear()
+        with pytest.raises(sqlite3.OperationalError):
+            await db.transaction(retries=1, backoff=0).run(
+                fail, sqlite3.OperationalError("database is locked")
+            )
+        assert len(calls) == 2
+        assert db.backend.metrics["transaction_retries_exhausted"] == 1
+
+        calls.clear()
+        with pytest.raises(ValueError, match="test"):
+            await db.transaction(retries=1, backoff=0).run(fail, ValueError("test"))
+        assert len(calls) == 1
+
+
+async def test_results_without_rows():
+    class Item(NamedTuple):
+        id: int
+
+    async with Database("sqlite:///:memory:", result="dict") as db, db.connection():
+        await db.execute("create table items (id integer)")
+        await db.execute("insert into items values (1)")
+
+        # DML does not return rows, the result format is not applied
+        assert await db.fetchall("update items set id = 2") == []
+        assert await db.fetchall("update items set id = 3", as_=Item) == []
+        assert await db.fetchone("update items set id = 4") is None
+        assert await db.fetchall("select id from items", as_=Item) == [Item(4)]
+
+
+async def test_codecs(tmp_path):
+    class Point(NamedTuple):
+        x: int
+        y: int
+
+    codecs = Codecs().register(
+        "point",
+        encoder=lambda p: f"{p.x};{p.y}",
+        decoder=lambda v: Point(*map(int, v.split(b";"))),
+        python_type=Point,
+    )
+    async with Database(f"sqlite:///{tmp_path / 'db.sqlite'}", codecs=codecs) as db:
+        await db.execute("create table points (value point)")
+        await db.execute("insert into points values (?)", Point(1, 2))
+        assert await db.fetchval("select value from points") == Point(1, 2)
+
+    # Codecs belong to databases, not to the process
+    other = Codecs().register("point", decoder=bytes.decode, encoder=repr, python_type=Point)
+    async with Database(f"sqlite:///{tmp_path / 'db.sqlite'}", codecs=other) as db:
+        await db.execute("insert into points values (?)", Point(3, 4))
+        assert await db.fetchall("select value from points") == [
+            ("1;2",),
+            ("Point(x=3, y=4)",),
+        ]
+
+    async with Database(f"sqlite:///{tmp_path / 'db.sqlite'}", codecs=codecs) as db:
+        assert await db.fetchval("select value from points limit 1") == Point(1, 2)
+
+    async with Database(f"sqlite:///{tmp_path / 'db.sqlite'}") as db:
+        with pytest.raises(sqlite3.ProgrammingError):
+            await db.execute("insert into points values (?)", Point(5, 6))
+
+
+async def test_run_batch():
+    async with Database("sqlite:///:memory:") as db, db.connection() as conn:
+        res = await conn.batch(
+            ("create table items (id integer primary key, name text)",),
+            ("insert into items (name) values (?)", "first"),
+            ("insert into items (name) values (?)", "second"),
+        )
+        assert res[1:] == [(1, 1), (1, 2)]
+
+        def count(raw, table):
+            assert isinstance(raw, sqlite3.Connection)
+            return raw.execute(f"select count(*) from {table}").fetchone()[0]  # noqa: S608
+
+        assert await conn.run(count, "items") == 2
+
+        await db.executemany("insert into items (name) values (?)", ("third",), ("fourth",))
+        assert await db.fetchval("select count(*) from items") == 4
+        assert await db.fetchmany(2, "select name from items order by id") == [
+            ("first",),
+            ("second",),
+        ]
+        assert [
+            rec["name"] async for rec in db.iterate("select name from items", chunk_size=3)
+        ] == [
+            "first",
+            "second",
+            "third",
+            "fourth",
+        ]
+
+
+async def test_shared_memory():
+    url = "sqlite:///file:test_shared?mode=memory&cache=shared"
+    async with Database(url) as db:
+        assert db.backend.keeper is not None
+
+        async with db.connection():
+            await db.execute("create table items (name text)")
+            await db.execute("insert into items values (?)", "first")
+
+        # The database is alive between connections
+        async with db.connection():
+            assert await db.fetchval("select name from items") == "first"
+
+    assert db.backend.keeper is None
+    async with Database(url) as db:
+        with pytest.raises(sqlite3.OperationalError, match="no such table"):
+            await db.fetchval("select name from items")
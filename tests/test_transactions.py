@@ -115,6 +115,52 @@ async def test_nested(pool: Database, user_cls: Model, manager: Manager):
     await db.execute(user_manager.drop_table().if_exists())
 
 
+async def test_lazy(db: Database, caplog: pytest.LogCaptureFixture):
+    def statements():
+        return [
+            rec.getMessage()
+            for rec in caplog.records
+            if any(cmd in rec.getMessage() for cmd in ("BEGIN", "SAVEPOINT", "COMMIT"))
+        ]
+
+    async with db.connection():
+        caplog.clear()
+        async with db.transaction(lazy=True), db.transaction(lazy=True):
+            pass
+
+        assert not statements()
+
+        async with db.transaction(lazy=True):
+            assert not statements()
+            async with db.transaction(lazy=True):
+                assert await db.fetchval("select 1") == 1
+                assert len(statements()) == 2
+
+            async with db.transaction(lazy=True):
+                pass
+
+        assert len(statements()) == 4
+
+
+async def test_lazy_rollback(db: Database):
+    await db.execute("create table if not exists lazy_test (x int)")
+    await db.execute("delete from lazy_test")
+
+    async with db.transaction(lazy=True):
+        await db.execute("insert into lazy_test values (1)")
+
+        with pytest.raises(ValueError, match="test"):
+            async with db.transaction(lazy=True):
+                await db.execute("insert into lazy_test values (2)")
+                raise ValueError("test")
+
+        async with db.transaction():
+            await db.execute("insert into lazy_test values (3)")
+
+    assert await db.fetchval("select count(*) from lazy_test") == 2
+    await db.execute("drop table lazy_test")
+
+
 async def test_connections(db: Database):
     async with db.transaction() as trans1:
         assert trans1
@@ -0,0 +1,131 @@
+import pytest
+import trio
+
+from aio_databases import Database
+from aio_databases.backends._trio_mysql import Pool
+
+
+@pytest.fixture
+def aiolib():
+    return "trio"
+
+
+@pytest.fixture
+def pool():
+    """The tests do not require a database server."""
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+
+    def close(self):
+        self.open = False
+
+    async def aclose(self):
+        self.open = False
+
+
+async def test_pool():
+    opened = []
+
+    async def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    pool = await Pool(connect, minsize=1, maxsize=2, pool_recycle=10).start()
+    assert pool.size == pool.freesize == 1
+
+    conn1 = await pool.acquire()
+    assert conn1 is opened[0]
+    conn2 = await pool.acquire()
+    assert pool.size == 2
+
+    # The pool is exhausted
+    with trio.move_on_after(0.01) as scope:
+        await pool.acquire()
+    assert scope.cancelled_caught
+
+    await pool.release(conn1)
+    assert await pool.acquire() is conn1
+
+    # Broken connections are dropped
+    conn2.close()
+    await pool.release(conn2)
+    assert pool.size == 1
+
+    await pool.release(conn1)
+    await pool.close()
+    assert pool.size == 0
+    assert not conn1.open
+
+    with pytest.raises(RuntimeError, match="closed"):
+        await pool.acquire()
+
+
+async def test_pool_recycle():
+    async def connect():
+        return FakeConnection()
+
+    pool = await Pool(connect, minsize=0, maxsize=2, pool_recycle=0.01).start()
+    conn = await pool.acquire()
+    await pool.release(conn)
+    assert pool.freesize == 1
+
+    # The reaper closes idle connections
+    await trio.sleep(0.05)
+    assert pool.freesize == pool.size == 0
+    assert not conn.open
+    await pool.close()
+
+
+async def test_pool_connect_outside_lock():
+    opened = trio.Event()
+
+    async def connect():
+        if opened.is_set():
+            await trio.sleep_forever()
+        opened.set()
+        return FakeConnection()
+
+    pool = await Pool(connect, minsize=1, maxsize=2).start()
+    conn = await pool.acquire()
+
+    async with trio.open_nursery() as tasks:
+        # A slow connect does not block other acquires
+        tasks.start_soon(pool.acquire)
+        await trio.sleep(0.01)
+        assert pool.size == 2
+
+        await pool.release(conn)
+        with trio.fail_after(0.1):
+            assert await pool.acquire() is conn
+        tasks.cancel_scope.cancel()
+
+    assert pool.size == 1
+
+
+async def test_pool_reaper(caplog):
+    class BrokenConnection(FakeConnection):
+        def close(self):
+            raise RuntimeError("broken")
+
+    async def connect():
+        return BrokenConnection()
+
+    async with trio.open_nursery() as tasks:
+        pool = await Pool(connect, minsize=1, maxsize=1, pool_recycle=0.01, nursery=tasks).start()
+
+        # Errors are logged and the reaper keeps running
+        await trio.sleep(0.05)
+        assert "Closing idle connections failed" in caplog.text
+        assert pool.freesize == 0
+
+        await pool.close()
+
+
+def test_backend():
+    db = Database("trio-mysql+pool://root@localhost/tests", minsize=2, maxsize=4, pool_recycle=60)
+    assert db.backend.name == "trio-mysql+pool"
+    assert db.backend.pool_options == {"minsize": 2, "maxsize": 4, "pool_recycle": 60}